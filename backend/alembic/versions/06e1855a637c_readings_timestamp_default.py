@@ -0,0 +1,65 @@
+"""server-side default for readings.timestamp
+
+Revision ID: 06e1855a637c
+Revises: 541225389d1b
+Create Date: 2026-10-14 11:26:40.518203
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "06e1855a637c"
+down_revision: Union[str, None] = "541225389d1b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# SQLite batch rebuilds reflect UUID columns as NUMERIC unless told otherwise
+_SQLITE_REFLECT_ARGS = [
+    sa.Column("id", sa.UUID(), primary_key=True, nullable=False),
+    sa.Column(
+        "device_uuid",
+        sa.UUID(),
+        sa.ForeignKey("devices.id", name="fk_readings_device_uuid_devices", ondelete="CASCADE"),
+        nullable=False,
+    ),
+]
+
+
+def _set_sqlite_default(server_default: sa.TextClause | None) -> None:
+    with op.batch_alter_table("readings", reflect_args=_SQLITE_REFLECT_ARGS) as batch_op:
+        batch_op.alter_column(
+            "timestamp",
+            existing_type=sa.DateTime(timezone=True),
+            existing_nullable=False,
+            server_default=server_default,
+        )
+
+    # The rebuild drops the DESC ordering of the covering index
+    op.drop_index("ix_readings_device_ts_desc", table_name="readings")
+    op.create_index(
+        "ix_readings_device_ts_desc",
+        "readings",
+        ["device_uuid", sa.text("timestamp DESC")],
+        unique=False,
+    )
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TABLE readings ALTER COLUMN timestamp SET DEFAULT clock_timestamp()")
+        return
+
+    _set_sqlite_default(sa.text("(strftime('%Y-%m-%d %H:%M:%f', 'now'))"))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TABLE readings ALTER COLUMN timestamp DROP DEFAULT")
+        return
+
+    _set_sqlite_default(None)
@@ -0,0 +1,47 @@
+"""partial index on active devices
+
+Revision ID: 1e765246ca97
+Revises: 7fbd2d83dc91
+Create Date: 2026-10-14 13:10:41.207583
+
+Device listings filter on is_active and order by device_id; the partial
+index covers exactly those rows. Built CONCURRENTLY on PostgreSQL so
+registrations and last_seen_at updates are not blocked meanwhile.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1e765246ca97"
+down_revision: Union[str, None] = "7fbd2d83dc91"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_devices_active",
+            "devices",
+            ["device_id"],
+            unique=False,
+            if_not_exists=True,
+            postgresql_where=sa.text("is_active"),
+            postgresql_concurrently=True,
+            sqlite_where=sa.text("is_active"),
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_devices_active",
+            table_name="devices",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,113 @@
+"""convert readings to a timescaledb hypertable
+
+Revision ID: 541225389d1b
+Revises: c108ab7d3e53
+Create Date: 2026-10-14 10:41:07.227590
+
+The primary key is widened to (id, timestamp) because a hypertable's
+unique constraints must include the partitioning column; SQLite gets the
+same key so migrated and freshly created schemas match. The hypertable
+and compression steps run only on PostgreSQL with the timescaledb
+extension available; plain PostgreSQL keeps a regular table.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "541225389d1b"
+down_revision: Union[str, None] = "c108ab7d3e53"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _set_sqlite_primary_key(columns: list[str]) -> None:
+    # SQLite batch rebuilds reflect UUID columns as NUMERIC unless told otherwise
+    reflect_args = [
+        sa.Column("id", sa.UUID(), primary_key=True, nullable=False),
+        sa.Column(
+            "device_uuid",
+            sa.UUID(),
+            sa.ForeignKey("devices.id", name="fk_readings_device_uuid_devices", ondelete="CASCADE"),
+            nullable=False,
+        ),
+    ]
+    with op.batch_alter_table("readings", reflect_args=reflect_args) as batch_op:
+        batch_op.create_primary_key("readings_pkey", columns)
+
+    # The rebuild drops the DESC ordering of the covering index
+    op.drop_index("ix_readings_device_ts_desc", table_name="readings")
+    op.create_index(
+        "ix_readings_device_ts_desc",
+        "readings",
+        ["device_uuid", sa.text("timestamp DESC")],
+        unique=False,
+    )
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        _set_sqlite_primary_key(["id", "timestamp"])
+        return
+
+    op.drop_constraint("readings_pkey", "readings", type_="primary")
+    op.create_primary_key("readings_pkey", "readings", ["id", "timestamp"])
+
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'timescaledb') THEN
+                CREATE EXTENSION IF NOT EXISTS timescaledb;
+                PERFORM create_hypertable(
+                    'readings', 'timestamp',
+                    chunk_time_interval => INTERVAL '1 day',
+                    create_default_indexes => false,
+                    migrate_data => true
+                );
+                ALTER TABLE readings SET (
+                    timescaledb.compress,
+                    timescaledb.compress_segmentby = 'device_uuid',
+                    timescaledb.compress_orderby = 'timestamp DESC'
+                );
+                PERFORM add_compression_policy('readings', INTERVAL '7 days');
+            END IF;
+        END
+        $$
+        """
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        _set_sqlite_primary_key(["id"])
+        return
+
+    # Hypertable conversion is one-way; undo compression but keep the
+    # composite key the hypertable requires.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'timescaledb') THEN
+                IF EXISTS (
+                    SELECT 1 FROM timescaledb_information.hypertables
+                    WHERE hypertable_name = 'readings'
+                ) THEN
+                    PERFORM remove_compression_policy('readings', if_exists => true);
+                    PERFORM decompress_chunk(c, if_compressed => true)
+                        FROM show_chunks('readings') c;
+                    ALTER TABLE readings SET (timescaledb.compress = false);
+                    RETURN;
+                END IF;
+            END IF;
+
+            ALTER TABLE readings DROP CONSTRAINT readings_pkey;
+            ALTER TABLE readings ADD CONSTRAINT readings_pkey PRIMARY KEY (id);
+        END
+        $$
+        """
+    )
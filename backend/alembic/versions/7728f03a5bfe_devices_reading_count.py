@@ -0,0 +1,47 @@
+"""per-device reading counter
+
+Revision ID: 7728f03a5bfe
+Revises: 1e765246ca97
+Create Date: 2026-10-14 14:02:17.415930
+
+The device summary reported COUNT(*) over each device's readings, a scan
+that grows with every ingest. devices.reading_count is incremented by the
+last_seen_at update ingest already issues; existing rows are backfilled
+once here.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7728f03a5bfe"
+down_revision: Union[str, None] = "1e765246ca97"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "devices",
+        sa.Column(
+            "reading_count",
+            sa.BigInteger(),
+            server_default=sa.text("0"),
+            nullable=False,
+            comment="Readings accepted for this device, bumped with last_seen_at",
+        ),
+    )
+    op.execute(
+        """
+        UPDATE devices SET reading_count = (
+            SELECT count(*) FROM readings WHERE readings.device_uuid = devices.id
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("devices", "reading_count")
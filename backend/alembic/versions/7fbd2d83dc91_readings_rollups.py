@@ -0,0 +1,119 @@
+"""per-minute and per-hour reading rollups
+
+Revision ID: 7fbd2d83dc91
+Revises: 06e1855a637c
+Create Date: 2026-10-14 12:05:12.804416
+
+TimescaleDB only. readings_1m is a continuous aggregate over readings;
+readings_1h is built hierarchically on top of it. Both keep sums and
+counts rather than averages so rollups can be re-aggregated exactly.
+Real-time aggregation is enabled, so buckets not yet materialized are
+computed from raw readings at query time. Nothing is created when
+readings is not a hypertable; STATS_USE_ROLLUPS must stay off there.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7fbd2d83dc91"
+down_revision: Union[str, None] = "06e1855a637c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'
+            ) OR NOT EXISTS (
+                SELECT 1 FROM timescaledb_information.hypertables
+                WHERE hypertable_name = 'readings'
+            ) THEN
+                RETURN;
+            END IF;
+
+            EXECUTE $sql$
+                CREATE MATERIALIZED VIEW readings_1m
+                WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+                SELECT
+                    device_uuid,
+                    time_bucket(INTERVAL '1 minute', timestamp) AS bucket,
+                    count(*) AS reading_count,
+                    min(timestamp) AS first_reading,
+                    max(timestamp) AS last_reading,
+                    min(temperature) AS temp_min,
+                    max(temperature) AS temp_max,
+                    sum(temperature) AS temp_sum,
+                    count(temperature) AS temp_count,
+                    min(humidity) AS humidity_min,
+                    max(humidity) AS humidity_max,
+                    sum(humidity) AS humidity_sum,
+                    count(humidity) AS humidity_count,
+                    min(voltage) AS voltage_min,
+                    max(voltage) AS voltage_max,
+                    sum(voltage) AS voltage_sum,
+                    count(voltage) AS voltage_count
+                FROM readings
+                GROUP BY device_uuid, time_bucket(INTERVAL '1 minute', timestamp)
+                WITH NO DATA
+            $sql$;
+
+            EXECUTE $sql$
+                CREATE MATERIALIZED VIEW readings_1h
+                WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+                SELECT
+                    device_uuid,
+                    time_bucket(INTERVAL '1 hour', bucket) AS bucket,
+                    sum(reading_count) AS reading_count,
+                    min(first_reading) AS first_reading,
+                    max(last_reading) AS last_reading,
+                    min(temp_min) AS temp_min,
+                    max(temp_max) AS temp_max,
+                    sum(temp_sum) AS temp_sum,
+                    sum(temp_count) AS temp_count,
+                    min(humidity_min) AS humidity_min,
+                    max(humidity_max) AS humidity_max,
+                    sum(humidity_sum) AS humidity_sum,
+                    sum(humidity_count) AS humidity_count,
+                    min(voltage_min) AS voltage_min,
+                    max(voltage_max) AS voltage_max,
+                    sum(voltage_sum) AS voltage_sum,
+                    sum(voltage_count) AS voltage_count
+                FROM readings_1m
+                GROUP BY device_uuid, time_bucket(INTERVAL '1 hour', bucket)
+                WITH NO DATA
+            $sql$;
+
+            PERFORM add_continuous_aggregate_policy(
+                'readings_1m',
+                start_offset => INTERVAL '2 hours',
+                end_offset => INTERVAL '1 minute',
+                schedule_interval => INTERVAL '1 minute'
+            );
+            PERFORM add_continuous_aggregate_policy(
+                'readings_1h',
+                start_offset => INTERVAL '3 days',
+                end_offset => INTERVAL '1 hour',
+                schedule_interval => INTERVAL '30 minutes'
+            );
+        END
+        $$
+        """
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS readings_1h")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS readings_1m")
@@ -0,0 +1,113 @@
+"""reference devices by uuid from readings
+
+Revision ID: b5f89b7fb042
+Revises: ff11f4f4230d
+Create Date: 2026-10-14 09:12:31.418207
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b5f89b7fb042"
+down_revision: Union[str, None] = "ff11f4f4230d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _reading_id_column() -> sa.Column:
+    # SQLite batch rebuilds reflect UUID columns as NUMERIC unless told otherwise
+    return sa.Column("id", sa.UUID(), primary_key=True, nullable=False)
+
+
+def upgrade() -> None:
+    op.drop_index("ix_readings_device_timestamp", table_name="readings", postgresql_using="btree")
+    op.add_column(
+        "readings",
+        sa.Column(
+            "device_uuid",
+            sa.UUID(),
+            nullable=True,
+            comment="Device that produced this reading",
+        ),
+    )
+
+    # Backfill from the string key before it is dropped
+    op.execute(
+        """
+        UPDATE readings
+        SET device_uuid = (
+            SELECT devices.id FROM devices WHERE devices.device_id = readings.device_id
+        )
+        """
+    )
+
+    with op.batch_alter_table(
+        "readings",
+        reflect_args=[
+            _reading_id_column(),
+            sa.Column("device_uuid", sa.UUID(), nullable=True),
+        ],
+    ) as batch_op:
+        batch_op.alter_column("device_uuid", existing_type=sa.UUID(), nullable=False)
+        batch_op.create_foreign_key(
+            "fk_readings_device_uuid_devices",
+            "devices",
+            ["device_uuid"],
+            ["id"],
+            ondelete="CASCADE",
+        )
+        batch_op.drop_column("device_id")
+
+    op.create_index(
+        "ix_readings_device_timestamp",
+        "readings",
+        ["device_uuid", sa.text("timestamp DESC")],
+        unique=False,
+        postgresql_using="btree",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_readings_device_timestamp", table_name="readings", postgresql_using="btree")
+    op.add_column(
+        "readings",
+        sa.Column(
+            "device_id",
+            sa.String(length=64),
+            nullable=True,
+            comment="Device that produced this reading",
+        ),
+    )
+
+    op.execute(
+        """
+        UPDATE readings
+        SET device_id = (
+            SELECT devices.device_id FROM devices WHERE devices.id = readings.device_uuid
+        )
+        """
+    )
+
+    with op.batch_alter_table("readings", reflect_args=[_reading_id_column()]) as batch_op:
+        batch_op.alter_column("device_id", existing_type=sa.String(length=64), nullable=False)
+        batch_op.create_foreign_key(
+            "fk_readings_device_id_devices",
+            "devices",
+            ["device_id"],
+            ["device_id"],
+            ondelete="CASCADE",
+        )
+        batch_op.drop_constraint("fk_readings_device_uuid_devices", type_="foreignkey")
+        batch_op.drop_column("device_uuid")
+
+    op.create_index(
+        "ix_readings_device_timestamp",
+        "readings",
+        ["device_id", "timestamp"],
+        unique=False,
+        postgresql_using="btree",
+    )
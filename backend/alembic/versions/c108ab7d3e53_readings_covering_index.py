@@ -0,0 +1,59 @@
+"""covering newest-first index on readings
+
+Revision ID: c108ab7d3e53
+Revises: b5f89b7fb042
+Create Date: 2026-10-14 10:02:54.961342
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c108ab7d3e53"
+down_revision: Union[str, None] = "b5f89b7fb042"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == "postgresql"
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        if is_postgresql:
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_readings_device_ts_desc "
+                "ON readings USING btree (device_uuid, timestamp DESC) "
+                "INCLUDE (temperature, humidity, voltage)"
+            )
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_readings_device_timestamp")
+            # Append-only table: vacuum on inserts so the visibility map stays
+            # current and index-only scans skip the heap.
+            op.execute("ALTER TABLE readings SET (autovacuum_vacuum_insert_scale_factor = 0.02)")
+        else:
+            op.execute(
+                "CREATE INDEX IF NOT EXISTS ix_readings_device_ts_desc "
+                "ON readings (device_uuid, timestamp DESC)"
+            )
+            op.execute("DROP INDEX IF EXISTS ix_readings_device_timestamp")
+
+
+def downgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == "postgresql"
+
+    with op.get_context().autocommit_block():
+        if is_postgresql:
+            op.execute("ALTER TABLE readings RESET (autovacuum_vacuum_insert_scale_factor)")
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_readings_device_timestamp "
+                "ON readings USING btree (device_uuid, timestamp DESC)"
+            )
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_readings_device_ts_desc")
+        else:
+            op.execute(
+                "CREATE INDEX IF NOT EXISTS ix_readings_device_timestamp "
+                "ON readings (device_uuid, timestamp DESC)"
+            )
+            op.execute("DROP INDEX IF EXISTS ix_readings_device_ts_desc")
@@ -4,18 +4,21 @@ Dependency injection for API routes.
 Provides factory functions for service and repository dependencies.
 """
 
-from typing import Annotated
+from typing import Annotated, Any
 
 from fastapi import Depends, Header, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.settings import Settings, get_settings
-from app.db import DatabaseSession
+from app.db import DatabaseSession, ReadOnlyDatabaseSession, get_db_session_context
 from app.infrastructure.websocket.manager import WebSocketManager
 from app.repositories.device_repository import DeviceRepository
 from app.repositories.reading_repository import ReadingRepository
 from app.services.aggregation_service import AggregationService
+from app.services.cache import TTLCache
+from app.services.device_cache import DeviceCache
 from app.services.device_service import DeviceService
-from app.services.ingestion_service import IngestionService
+from app.services.ingestion_service import IngestionService, ReadingBatchWriter
 
 # Singleton WebSocket manager
 _ws_manager: WebSocketManager | None = None
@@ -29,55 +32,186 @@ def get_ws_manager() -> WebSocketManager:
     return _ws_manager
 
 
+# Singleton batched reading writer
+_reading_writer: ReadingBatchWriter | None = None
+
+
+def get_reading_writer() -> ReadingBatchWriter:
+    """Get the batched reading writer singleton."""
+    global _reading_writer
+    if _reading_writer is None:
+        settings = get_settings()
+        _reading_writer = ReadingBatchWriter(
+            get_db_session_context,
+            max_batch_size=settings.ingest_batch_size,
+            max_batch_delay=settings.ingest_batch_delay_ms / 1000,
+        )
+    return _reading_writer
+
+
+# Singleton device cache for the ingest path
+_device_cache: DeviceCache | None = None
+
+
+async def get_device_cache() -> DeviceCache:
+    """Get the device cache singleton."""
+    global _device_cache
+    if _device_cache is None:
+        settings = get_settings()
+        _device_cache = DeviceCache(
+            maxsize=settings.ingest_device_cache_size,
+            ttl=settings.ingest_device_cache_ttl,
+        )
+    return _device_cache
+
+
+# Singleton aggregation cache, shared by every request's service
+_aggregation_cache: TTLCache[str, Any] | None = None
+
+
+async def get_aggregation_cache() -> TTLCache[str, Any]:
+    """Get the aggregation cache singleton."""
+    global _aggregation_cache
+    if _aggregation_cache is None:
+        settings = get_settings()
+        _aggregation_cache = TTLCache(
+            maxsize=settings.aggregation_cache_max_entries,
+            ttl=settings.aggregation_cache_ttl,
+        )
+    return _aggregation_cache
+
+
+# FastAPI runs plain-function dependencies in a worker thread. These
+# singletons are also fetched outside requests, so requests get them
+# through coroutine wrappers that stay on the event loop.
+async def _settings_dep() -> Settings:
+    return get_settings()
+
+
+async def _ws_manager_dep() -> WebSocketManager:
+    return get_ws_manager()
+
+
+async def _reading_writer_dep() -> ReadingBatchWriter:
+    return get_reading_writer()
+
+
 # Repository dependencies
-def get_device_repository(session: DatabaseSession) -> DeviceRepository:
+class Repositories:
+    """
+    Repositories bound to a single request's database session.
+
+    Each repository is built on first access, so routes only pay for the
+    repositories their services actually use.
+    """
+
+    __slots__ = ("_session", "_devices", "_readings")
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        self._devices: DeviceRepository | None = None
+        self._readings: ReadingRepository | None = None
+
+    @property
+    def devices(self) -> DeviceRepository:
+        """Device repository for this request."""
+        if self._devices is None:
+            self._devices = DeviceRepository(self._session)
+        return self._devices
+
+    @property
+    def readings(self) -> ReadingRepository:
+        """Reading repository for this request."""
+        if self._readings is None:
+            self._readings = ReadingRepository(self._session)
+        return self._readings
+
+
+async def get_repositories(session: DatabaseSession) -> Repositories:
+    """
+    Get the request's repositories.
+
+    FastAPI caches this per request, so every dependency in the request
+    shares the same repository instances.
+    """
+    return Repositories(session)
+
+
+async def get_readonly_repositories(session: ReadOnlyDatabaseSession) -> Repositories:
+    """
+    Get repositories over an autocommit session for read-only routes.
+
+    Must not be mixed with ``get_repositories`` in one request, which
+    would open a second session and connection.
+    """
+    return Repositories(session)
+
+
+async def get_device_repository(
+    repos: Annotated[Repositories, Depends(get_repositories)],
+) -> DeviceRepository:
     """Get device repository instance."""
-    return DeviceRepository(session)
+    return repos.devices
 
 
-def get_reading_repository(session: DatabaseSession) -> ReadingRepository:
+async def get_reading_repository(
+    repos: Annotated[Repositories, Depends(get_repositories)],
+) -> ReadingRepository:
     """Get reading repository instance."""
-    return ReadingRepository(session)
+    return repos.readings
 
 
 # Service dependencies
-def get_device_service(
-    device_repo: Annotated[DeviceRepository, Depends(get_device_repository)],
+async def get_device_service(
+    repos: Annotated[Repositories, Depends(get_repositories)],
+    device_cache: Annotated[DeviceCache, Depends(get_device_cache)],
 ) -> DeviceService:
     """Get device service instance."""
-    return DeviceService(device_repo)
+    return DeviceService(repos.devices, device_cache)
+
+
+async def get_aggregation_service(
+    repos: Annotated[Repositories, Depends(get_readonly_repositories)],
+    settings: Annotated[Settings, Depends(_settings_dep)],
+    cache: Annotated[TTLCache[str, Any], Depends(get_aggregation_cache)],
+) -> AggregationService:
+    """Get aggregation service instance for read-only routes."""
+    return AggregationService(repos.devices, repos.readings, settings, cache)
 
 
-def get_aggregation_service(
-    device_repo: Annotated[DeviceRepository, Depends(get_device_repository)],
-    reading_repo: Annotated[ReadingRepository, Depends(get_reading_repository)],
-    settings: Annotated[Settings, Depends(get_settings)],
+async def get_streaming_aggregation_service(
+    repos: Annotated[Repositories, Depends(get_repositories)],
+    settings: Annotated[Settings, Depends(_settings_dep)],
+    cache: Annotated[TTLCache[str, Any], Depends(get_aggregation_cache)],
 ) -> AggregationService:
-    """Get aggregation service instance."""
-    return AggregationService(device_repo, reading_repo, settings)
+    """Get aggregation service instance whose session can hold a cursor open."""
+    return AggregationService(repos.devices, repos.readings, settings, cache)
 
 
-def get_ingestion_service(
-    device_repo: Annotated[DeviceRepository, Depends(get_device_repository)],
-    reading_repo: Annotated[ReadingRepository, Depends(get_reading_repository)],
-    settings: Annotated[Settings, Depends(get_settings)],
-    ws_manager: Annotated[WebSocketManager, Depends(get_ws_manager)],
+async def get_ingestion_service(
+    repos: Annotated[Repositories, Depends(get_repositories)],
+    settings: Annotated[Settings, Depends(_settings_dep)],
+    ws_manager: Annotated[WebSocketManager, Depends(_ws_manager_dep)],
+    reading_writer: Annotated[ReadingBatchWriter, Depends(_reading_writer_dep)],
+    device_cache: Annotated[DeviceCache, Depends(get_device_cache)],
 ) -> IngestionService:
     """Get ingestion service instance."""
-    return IngestionService(device_repo, reading_repo, settings, ws_manager)
+    return IngestionService(
+        repos.devices, repos.readings, settings, ws_manager, reading_writer, device_cache
+    )
 
 
 # Auth dependency
-def get_api_key(
+async def get_api_key(
     x_api_key: Annotated[str | None, Header(alias="X-API-Key")] = None,
 ) -> str | None:
     """Extract API key from request header."""
     return x_api_key
 
 
-def require_admin_api_key(
+async def require_admin_api_key(
     x_api_key: Annotated[str | None, Header(alias="X-API-Key")] = None,
-    settings: Settings = Depends(get_settings),
+    settings: Settings = Depends(_settings_dep),
 ) -> str:
     """
     Require admin API key for protected endpoints.
@@ -105,8 +239,11 @@ DeviceRepositoryDep = Annotated[DeviceRepository, Depends(get_device_repository)
 ReadingRepositoryDep = Annotated[ReadingRepository, Depends(get_reading_repository)]
 DeviceServiceDep = Annotated[DeviceService, Depends(get_device_service)]
 AggregationServiceDep = Annotated[AggregationService, Depends(get_aggregation_service)]
+StreamingAggregationServiceDep = Annotated[
+    AggregationService, Depends(get_streaming_aggregation_service)
+]
 IngestionServiceDep = Annotated[IngestionService, Depends(get_ingestion_service)]
-WebSocketManagerDep = Annotated[WebSocketManager, Depends(get_ws_manager)]
+WebSocketManagerDep = Annotated[WebSocketManager, Depends(_ws_manager_dep)]
 ApiKeyDep = Annotated[str | None, Depends(get_api_key)]
 AdminApiKeyDep = Annotated[str, Depends(require_admin_api_key)]
-SettingsDep = Annotated[Settings, Depends(get_settings)]
+SettingsDep = Annotated[Settings, Depends(_settings_dep)]
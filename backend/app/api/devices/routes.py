@@ -4,16 +4,22 @@ Devices API routes.
 Handles device management and query operations.
 """
 
+from collections.abc import AsyncIterator
 from datetime import datetime
+from typing import Any
 
-from fastapi import APIRouter, HTTPException, Query, status
+import orjson
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 
 from app.api.dependencies import (
     AdminApiKeyDep,
     AggregationServiceDep,
     DeviceServiceDep,
+    StreamingAggregationServiceDep,
 )
 from app.api.dto import (
+    DeviceBatchRegistrationDTO,
     DeviceDTO,
     DeviceRegistrationDTO,
     DeviceRegistrationResponseDTO,
@@ -23,25 +29,61 @@ from app.api.dto import (
     ResponseEnvelope,
 )
 from app.config.logging import get_logger
-from app.services.device_service import DeviceExistsError, DeviceNotFoundError
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/devices", tags=["Devices"])
 
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against an entity tag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+async def _stream_envelope(batches: AsyncIterator[list[dict[str, Any]]]) -> AsyncIterator[bytes]:
+    """Encode a successful ResponseEnvelope whose data array is streamed."""
+    yield (
+        b'{"success":true,"error":null,"code":null,"timestamp":'
+        + orjson.dumps(datetime.utcnow())
+        + b',"data":['
+    )
+
+    separator = b""
+    async for batch in batches:
+        if batch:
+            yield separator + b",".join(orjson.dumps(item) for item in batch)
+            separator = b","
+
+    yield b"]}"
+
+
 @router.get(
     "",
     response_model=ResponseEnvelope[list[DeviceSummaryDTO]],
     summary="List all devices",
     description="Get a list of all registered devices with their latest reading info.",
+    responses={
+        200: {"description": "Device summaries"},
+        304: {"description": "Device list unchanged since the If-None-Match ETag"},
+    },
 )
 async def list_devices(
     aggregation_service: AggregationServiceDep,
+    response: Response,
     include_inactive: bool = Query(default=False, description="Include inactive devices"),
-) -> ResponseEnvelope[list[DeviceSummaryDTO]]:
+    if_none_match: str | None = Header(default=None),
+) -> ResponseEnvelope[list[DeviceSummaryDTO]] | Response:
     """List all registered devices with summary information."""
-    summaries = await aggregation_service.get_all_devices_summary()
+    etag = await aggregation_service.get_devices_etag()
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    summaries = await aggregation_service.get_all_devices_summary(etag)
+    response.headers["ETag"] = etag
     return ResponseEnvelope(success=True, data=summaries)
 
 
@@ -81,10 +123,47 @@ async def register_device(
             data=DeviceRegistrationResponseDTO(**result),
         )
 
-    except DeviceExistsError as e:
+    except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=e.message,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
+@router.post(
+    "/batch",
+    response_model=ResponseEnvelope[list[DeviceRegistrationResponseDTO]],
+    status_code=status.HTTP_201_CREATED,
+    summary="Register several devices",
+    description="""
+    Register up to 1000 IoT devices in one request, e.g. when onboarding a fleet.
+
+    **Authentication:** Requires admin API key (X-API-Key header).
+
+    **Important:** Device API keys are only returned once. Store them securely.
+    """,
+    responses={
+        201: {"description": "All devices registered"},
+        400: {"description": "A device_id is repeated in the batch"},
+        401: {"description": "Missing admin API key"},
+        403: {"description": "Invalid admin API key"},
+        409: {"description": "A device already exists; none were registered"},
+    },
+)
+async def register_devices(
+    payload: DeviceBatchRegistrationDTO,
+    device_service: DeviceServiceDep,
+    _: AdminApiKeyDep,
+) -> ResponseEnvelope[list[DeviceRegistrationResponseDTO]]:
+    """Register several devices and generate their API keys."""
+    try:
+        results = await device_service.register_devices(
+            [(device.device_id, device.name) for device in payload.devices]
+        )
+
+        return ResponseEnvelope(
+            success=True,
+            data=[DeviceRegistrationResponseDTO(**result) for result in results],
         )
 
     except ValueError as e:
@@ -109,15 +188,8 @@ async def get_device(
     device_service: DeviceServiceDep,
 ) -> ResponseEnvelope[DeviceDTO]:
     """Get device information by device_id."""
-    try:
-        device = await device_service.get_device(device_id)
-        return ResponseEnvelope(success=True, data=device)
-
-    except DeviceNotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=e.message,
-        )
+    device = await device_service.get_device(device_id)
+    return ResponseEnvelope(success=True, data=device)
 
 
 @router.get(
@@ -127,25 +199,25 @@ async def get_device(
     description="Get the most recent sensor reading for a device.",
     responses={
         200: {"description": "Latest reading (or null if none exist)"},
+        304: {"description": "Latest reading unchanged since the If-None-Match ETag"},
         404: {"description": "Device not found"},
     },
 )
 async def get_latest_reading(
     device_id: str,
     aggregation_service: AggregationServiceDep,
-    device_service: DeviceServiceDep,
-) -> ResponseEnvelope[ReadingDTO | None]:
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+) -> ResponseEnvelope[ReadingDTO | None] | Response:
     """Get the latest reading for a device."""
-    # Verify device exists
-    try:
-        await device_service.get_device(device_id)
-    except DeviceNotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=e.message,
-        )
-
     latest = await aggregation_service.get_latest_reading(device_id)
+
+    # Reading IDs are unique and readings immutable, so the ID is the version
+    etag = f'"{latest["id"]}"' if latest else '"none"'
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
     return ResponseEnvelope(success=True, data=latest)
 
 
@@ -167,7 +239,6 @@ async def get_latest_reading(
 async def get_device_stats(
     device_id: str,
     aggregation_service: AggregationServiceDep,
-    device_service: DeviceServiceDep,
     range: str = Query(
         default="24h",
         pattern=r"^\d+[hdmw]$",
@@ -175,15 +246,6 @@ async def get_device_stats(
     ),
 ) -> ResponseEnvelope[DeviceStatsDTO]:
     """Get aggregated statistics for a device."""
-    # Verify device exists
-    try:
-        await device_service.get_device(device_id)
-    except DeviceNotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=e.message,
-        )
-
     try:
         stats = await aggregation_service.get_device_stats(device_id, range)
         return ResponseEnvelope(success=True, data=stats)
@@ -212,8 +274,7 @@ async def get_device_stats(
 )
 async def get_device_history(
     device_id: str,
-    aggregation_service: AggregationServiceDep,
-    device_service: DeviceServiceDep,
+    aggregation_service: StreamingAggregationServiceDep,
     range: str | None = Query(
         default="24h",
         pattern=r"^\d+[hdmw]$",
@@ -233,26 +294,17 @@ async def get_device_history(
         le=10000,
         description="Maximum readings to return",
     ),
-) -> ResponseEnvelope[list[ReadingDTO]]:
-    """Get historical readings for a device."""
-    # Verify device exists
+) -> StreamingResponse:
+    """Get historical readings for a device, streamed as they are read."""
     try:
-        await device_service.get_device(device_id)
-    except DeviceNotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=e.message,
-        )
-
-    try:
-        history = await aggregation_service.get_history(
+        batches = await aggregation_service.stream_history(
             device_id=device_id,
             start=start,
             end=end,
             range_str=range if not start else None,
             limit=limit,
         )
-        return ResponseEnvelope(success=True, data=history)
+        return StreamingResponse(_stream_envelope(batches), media_type="application/json")
 
     except ValueError as e:
         raise HTTPException(
@@ -283,12 +335,5 @@ async def deactivate_device(
     _: AdminApiKeyDep,
 ) -> ResponseEnvelope[dict]:
     """Deactivate a device."""
-    try:
-        result = await device_service.deactivate_device(device_id)
-        return ResponseEnvelope(success=True, data=result)
-
-    except DeviceNotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=e.message,
-        )
+    result = await device_service.deactivate_device(device_id)
+    return ResponseEnvelope(success=True, data=result)
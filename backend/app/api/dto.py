@@ -9,6 +9,9 @@ from typing import Generic, TypeVar
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.domain.entities.device import DEVICE_ID_PATTERN
+from app.domain.value_objects.metrics import SensorMetrics
+
 T = TypeVar("T")
 
 
@@ -44,24 +47,29 @@ class ResponseEnvelope(BaseModel, Generic[T]):
 
 
 class MetricsDTO(BaseModel):
-    """Sensor metrics data transfer object."""
+    """
+    Sensor metrics data transfer object.
+
+    Bounds are SensorMetrics' own limits, so a validated instance can be
+    converted with SensorMetrics.unchecked.
+    """
 
     temperature: float | None = Field(
         default=None,
-        ge=-40.0,
-        le=85.0,
+        ge=SensorMetrics.TEMP_MIN,
+        le=SensorMetrics.TEMP_MAX,
         description="Temperature in degrees Celsius",
     )
     humidity: float | None = Field(
         default=None,
-        ge=0.0,
-        le=100.0,
+        ge=SensorMetrics.HUMIDITY_MIN,
+        le=SensorMetrics.HUMIDITY_MAX,
         description="Relative humidity percentage",
     )
     voltage: float | None = Field(
         default=None,
-        ge=0.0,
-        le=24.0,
+        ge=SensorMetrics.VOLTAGE_MIN,
+        le=SensorMetrics.VOLTAGE_MAX,
         description="Power/battery voltage in volts",
     )
 
@@ -89,7 +97,7 @@ class IngestPayloadDTO(BaseModel):
     device_id: str = Field(
         min_length=1,
         max_length=64,
-        pattern=r"^[a-zA-Z0-9_-]+$",
+        pattern=DEVICE_ID_PATTERN,
         description="Device identifier",
     )
     metrics: MetricsDTO = Field(description="Sensor metric values")
@@ -110,6 +118,21 @@ class IngestPayloadDTO(BaseModel):
     )
 
 
+class IngestBatchPayloadDTO(BaseModel):
+    """
+    Payload for ingesting several readings in one request.
+
+    Readings may come from different devices; the batch is accepted or
+    rejected as a whole.
+    """
+
+    readings: list[IngestPayloadDTO] = Field(
+        min_length=1,
+        max_length=1000,
+        description="Readings to ingest",
+    )
+
+
 class ReadingDTO(BaseModel):
     """Reading response DTO."""
 
@@ -147,7 +170,7 @@ class DeviceRegistrationDTO(BaseModel):
     device_id: str = Field(
         min_length=1,
         max_length=64,
-        pattern=r"^[a-zA-Z0-9_-]+$",
+        pattern=DEVICE_ID_PATTERN,
         description="Device identifier",
     )
     name: str | None = Field(
@@ -168,6 +191,20 @@ class DeviceRegistrationDTO(BaseModel):
     )
 
 
+class DeviceBatchRegistrationDTO(BaseModel):
+    """
+    Request for registering several devices at once.
+
+    The batch is accepted or rejected as a whole.
+    """
+
+    devices: list[DeviceRegistrationDTO] = Field(
+        min_length=1,
+        max_length=1000,
+        description="Devices to register",
+    )
+
+
 class DeviceRegistrationResponseDTO(BaseModel):
     """Device registration response DTO."""
 
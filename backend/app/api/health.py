@@ -2,12 +2,11 @@
 Health check and system info routes.
 """
 
-from datetime import datetime
-
 from fastapi import APIRouter
 
 from app.api.dependencies import WebSocketManagerDep
 from app.api.dto import ResponseEnvelope
+from app.domain.clock import iso_now
 
 router = APIRouter(tags=["Health"])
 
@@ -26,7 +25,7 @@ async def health_check(
         success=True,
         data={
             "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": iso_now(),
             "websocket_connections": ws_manager.connection_count,
         },
     )
@@ -4,23 +4,25 @@ Ingest API routes.
 Handles sensor data ingestion from ESP32 devices.
 """
 
-from datetime import datetime
-
 from fastapi import APIRouter, status
 
 from app.api.dependencies import ApiKeyDep, IngestionServiceDep
-from app.api.dto import IngestPayloadDTO, ReadingDTO, ResponseEnvelope
+from app.api.dto import IngestBatchPayloadDTO, IngestPayloadDTO, ReadingDTO, ResponseEnvelope
+from app.api.json_route import ORJSONRoute
 from app.config.logging import get_logger
+from app.domain.value_objects.metrics import SensorMetrics
 from app.services.ingestion_service import (
     AuthenticationError,
     DeviceInactiveError,
     DeviceNotFoundError,
+    IngestionError,
     InvalidPayloadError,
 )
 
 logger = get_logger(__name__)
 
-router = APIRouter(prefix="/ingest", tags=["Ingestion"])
+# Device payloads are the hottest request bodies; decode them with orjson
+router = APIRouter(prefix="/ingest", tags=["Ingestion"], route_class=ORJSONRoute)
 
 
 @router.post(
@@ -62,9 +64,15 @@ async def ingest_reading(
     6. Broadcast to WebSocket subscribers
     """
     try:
+        # MetricsDTO already enforced SensorMetrics' bounds
+        metrics = payload.metrics
         reading = await service.ingest(
             device_id=payload.device_id,
-            metrics_data=payload.metrics.model_dump(exclude_none=True),
+            metrics=SensorMetrics.unchecked(
+                temperature=metrics.temperature,
+                humidity=metrics.humidity,
+                voltage=metrics.voltage,
+            ),
             api_key=api_key,
         )
 
@@ -86,7 +94,6 @@ async def ingest_reading(
             success=False,
             error=e.message,
             code=e.code,
-            timestamp=datetime.utcnow(),
         )
 
     except DeviceNotFoundError as e:
@@ -95,7 +102,6 @@ async def ingest_reading(
             success=False,
             error=e.message,
             code=e.code,
-            timestamp=datetime.utcnow(),
         )
 
     except DeviceInactiveError as e:
@@ -104,7 +110,6 @@ async def ingest_reading(
             success=False,
             error=e.message,
             code=e.code,
-            timestamp=datetime.utcnow(),
         )
 
     except InvalidPayloadError as e:
@@ -113,5 +118,63 @@ async def ingest_reading(
             success=False,
             error=e.message,
             code=e.code,
-            timestamp=datetime.utcnow(),
+        )
+
+
+@router.post(
+    "/batch",
+    response_model=ResponseEnvelope[list[ReadingDTO]],
+    status_code=status.HTTP_201_CREATED,
+    summary="Ingest a batch of sensor readings",
+    description="""
+    Submit up to 1000 sensor readings in one request, e.g. readings a device
+    buffered while offline.
+
+    **Authentication:** Requires X-API-Key header with valid device API key.
+
+    **Timestamps:** Server assigns UTC timestamps. Client timestamps are ignored.
+
+    **Atomicity:** If any reading is rejected, none are stored.
+    """,
+    responses={
+        201: {"description": "Readings ingested successfully"},
+        400: {"description": "Invalid payload"},
+        401: {"description": "Missing or invalid API key"},
+        404: {"description": "Device not found"},
+        422: {"description": "Validation error"},
+    },
+)
+async def ingest_readings(
+    payload: IngestBatchPayloadDTO,
+    service: IngestionServiceDep,
+    api_key: ApiKeyDep,
+) -> ResponseEnvelope[list[ReadingDTO]]:
+    """Ingest several sensor readings with one round trip per step."""
+    try:
+        readings = await service.ingest_batch(
+            [
+                (
+                    item.device_id,
+                    SensorMetrics.unchecked(
+                        temperature=item.metrics.temperature,
+                        humidity=item.metrics.humidity,
+                        voltage=item.metrics.voltage,
+                    ),
+                )
+                for item in payload.readings
+            ],
+            api_key=api_key,
+        )
+
+        return ResponseEnvelope(
+            success=True,
+            data=[ReadingDTO(**reading.to_dict()) for reading in readings],
+        )
+
+    except IngestionError as e:
+        logger.warning("Batch ingestion rejected", code=e.code, error=e.message)
+        return ResponseEnvelope(
+            success=False,
+            error=e.message,
+            code=e.code,
         )
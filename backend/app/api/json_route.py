@@ -0,0 +1,42 @@
+"""
+JSON request route.
+
+Route class that decodes JSON request bodies with orjson.
+"""
+
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+
+class ORJSONRequest(Request):
+    """
+    Request whose JSON body is decoded with orjson.
+
+    FastAPI parses bodies through the stdlib ``json`` module before
+    validating them; orjson decodes the same bytes several times faster.
+    Its JSONDecodeError subclasses the stdlib one, so malformed bodies
+    still get FastAPI's 422 response.
+    """
+
+    async def json(self) -> Any:
+        """Decode the request body as JSON, once."""
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """API route that hands endpoints an ``ORJSONRequest``."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        """Wrap the default handler to swap in the orjson request."""
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await handler(ORJSONRequest(request.scope, request.receive))
+
+        return route_handler
@@ -4,15 +4,20 @@ Realtime WebSocket API routes.
 Handles WebSocket connections for live sensor data streaming.
 """
 
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from app.api.dependencies import get_ws_manager
 from app.config.logging import get_logger
+from app.infrastructure.websocket.manager import ALL_DEVICES
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/stream", tags=["Realtime"])
 
+# Keep-alive reply, encoded once
+_PONG = orjson.dumps({"type": "pong"}).decode()
+
 
 @router.websocket("/devices/{device_id}")
 async def stream_device_readings(
@@ -63,7 +68,7 @@ async def stream_device_readings(
                 action = data.get("action")
 
                 if action == "ping":
-                    await websocket.send_json({"type": "pong"})
+                    await websocket.send_text(_PONG)
 
                 elif action == "subscribe":
                     # Subscribe to additional device
@@ -121,7 +126,7 @@ async def stream_all_devices(websocket: WebSocket) -> None:
 
     try:
         # Special subscription key for all devices
-        await manager.subscribe(websocket, "__all__")
+        await manager.subscribe(websocket, ALL_DEVICES)
         await manager.send_ack(websocket, "Subscribed to all devices")
 
         logger.info("WebSocket subscribed to all devices stream")
@@ -132,7 +137,7 @@ async def stream_all_devices(websocket: WebSocket) -> None:
                 action = data.get("action")
 
                 if action == "ping":
-                    await websocket.send_json({"type": "pong"})
+                    await websocket.send_text(_PONG)
                 else:
                     await manager.send_error(
                         websocket,
@@ -7,14 +7,31 @@ Supports both JSON (production) and console (development) formats.
 
 import logging
 import sys
+from collections.abc import Callable
 from typing import Any
 
+import orjson
 import structlog
 from structlog.typing import Processor
 
 from app.config.settings import Settings
 
 
+def _orjson_dumps(obj: Any, default: Callable[[Any], Any] | None = None) -> str:
+    """
+    Serialize a log event with orjson.
+
+    Several times faster than the stdlib json module, and renders
+    datetimes and UUIDs natively; anything else falls back to the
+    renderer's ``default``.
+    """
+    return orjson.dumps(
+        obj,
+        default=default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z,
+    ).decode()
+
+
 def setup_logging(settings: Settings) -> None:
     """
     Configure structured logging for the application.
@@ -34,6 +51,8 @@ def setup_logging(settings: Settings) -> None:
 
     # Shared processors for all environments
     shared_processors: list[Processor] = [
+        # Drop records below the level before any formatting work is done
+        structlog.stdlib.filter_by_level,
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_log_level,
         structlog.stdlib.add_logger_name,
@@ -49,7 +68,7 @@ def setup_logging(settings: Settings) -> None:
         processors: list[Processor] = [
             *shared_processors,
             structlog.processors.format_exc_info,
-            structlog.processors.JSONRenderer(),
+            structlog.processors.JSONRenderer(serializer=_orjson_dumps),
         ]
     else:
         # Development: Human-readable console output
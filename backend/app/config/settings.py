@@ -5,7 +5,7 @@ All configuration is loaded from environment variables with sensible defaults.
 Secrets are never stored in code.
 """
 
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from typing import Literal
 
 from pydantic import Field, field_validator
@@ -40,9 +40,28 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = Field(..., description="Database connection URL (PostgreSQL, SQLite, etc.)")
-    db_pool_size: int = Field(default=5, ge=1, le=100, description="Database pool size")
+    db_pool_size: int = Field(default=20, ge=1, le=100, description="Database pool size")
     db_max_overflow: int = Field(default=10, ge=0, le=100, description="Max pool overflow")
     db_pool_timeout: int = Field(default=30, ge=1, description="Pool timeout in seconds")
+    db_pool_pre_ping: bool = Field(
+        default=False, description="Ping connections on checkout (one extra round trip)"
+    )
+    db_prepared_statement_cache_size: int = Field(
+        default=256, ge=0, description="Prepared statements cached per asyncpg connection"
+    )
+    db_pool_recycle: int = Field(
+        default=1800,
+        ge=-1,
+        description="Seconds before a pooled connection is replaced (-1: never)",
+    )
+    db_pool_use_lifo: bool = Field(
+        default=True, description="Reuse the most recently returned pooled connection first"
+    )
+    db_jit: bool = Field(default=False, description="Enable PostgreSQL JIT compilation")
+    db_synchronous_commit: bool = Field(
+        default=True,
+        description="Wait for the WAL flush on commit (off risks losing the latest commits)",
+    )
 
     # Security
     api_secret_key: str = Field(..., min_length=16, description="API secret key")
@@ -62,13 +81,37 @@ class Settings(BaseSettings):
     )
     ws_max_connections: int = Field(default=1000, ge=1, description="Maximum WebSocket connections")
 
+    # Ingestion
+    ingest_batch_size: int = Field(
+        default=500, ge=1, le=10000, description="Maximum readings per batched INSERT"
+    )
+    ingest_batch_delay_ms: int = Field(
+        default=50, ge=1, le=5000, description="Maximum wait for an INSERT batch to fill"
+    )
+    ingest_wait_for_commit: bool = Field(
+        default=True, description="Acknowledge ingest only after the reading is committed"
+    )
+    ingest_device_cache_size: int = Field(
+        default=10_000, ge=1, description="Maximum devices kept in the ingest device cache"
+    )
+    ingest_device_cache_ttl: int = Field(
+        default=60, ge=0, description="Ingest device cache TTL in seconds (0 disables)"
+    )
+
     # Aggregation
     aggregation_cache_ttl: int = Field(
         default=60, ge=1, description="Aggregation cache TTL in seconds"
     )
+    aggregation_cache_max_entries: int = Field(
+        default=1024, ge=1, description="Maximum entries kept in the aggregation cache"
+    )
     history_default_limit: int = Field(
         default=1000, ge=1, le=10000, description="Default history query limit"
     )
+    stats_use_rollups: bool = Field(
+        default=False,
+        description="Serve stats from the TimescaleDB readings_1m/readings_1h rollups",
+    )
 
     @field_validator("log_level", mode="before")
     @classmethod
@@ -92,12 +135,12 @@ class Settings(BaseSettings):
         """Validate device API keys format."""
         return v.strip() if v else ""
 
-    @property
-    def device_api_keys_set(self) -> set[str]:
-        """Parse device API keys into a set for O(1) lookup."""
+    @cached_property
+    def device_api_keys_set(self) -> frozenset[str]:
+        """Parse device API keys into a set for O(1) lookup, once per instance."""
         if not self.device_api_keys:
-            return set()
-        return {key.strip() for key in self.device_api_keys.split(",") if key.strip()}
+            return frozenset()
+        return frozenset(key.strip() for key in self.device_api_keys.split(",") if key.strip())
 
     @property
     def is_production(self) -> bool:
@@ -10,9 +10,13 @@ from app.db.base import Base
 from app.db.models import DeviceModel, ReadingModel
 from app.db.session import (
     DatabaseSession,
+    ReadOnlyDatabaseSession,
     close_database,
     get_db_session,
+    get_db_session_context,
+    get_readonly_db_session,
     init_database,
+    listen,
 )
 
 __all__ = [
@@ -20,7 +24,11 @@ __all__ = [
     "DeviceModel",
     "ReadingModel",
     "DatabaseSession",
+    "ReadOnlyDatabaseSession",
     "get_db_session",
+    "get_db_session_context",
+    "get_readonly_db_session",
     "init_database",
     "close_database",
+    "listen",
 ]
@@ -10,17 +10,50 @@ from typing import Any
 from uuid import UUID
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     DateTime,
     Float,
     ForeignKey,
     Index,
     String,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql.expression import FunctionElement
 
 from app.db.base import Base
+from app.domain.ids import uuid7
+
+
+class ClockTimestamp(FunctionElement[datetime]):
+    """
+    Current wall-clock time for column defaults.
+
+    Unlike ``now()``, PostgreSQL's ``clock_timestamp()`` advances within a
+    transaction, so rows in one batched INSERT get distinct, increasing
+    timestamps. SQLite uses a millisecond-precision UTC time.
+    """
+
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(ClockTimestamp)
+def _compile_clock_timestamp(element: ClockTimestamp, compiler: Any, **kw: Any) -> str:
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(ClockTimestamp, "postgresql")
+def _compile_clock_timestamp_pg(element: ClockTimestamp, compiler: Any, **kw: Any) -> str:
+    return "clock_timestamp()"
+
+
+@compiles(ClockTimestamp, "sqlite")
+def _compile_clock_timestamp_sqlite(element: ClockTimestamp, compiler: Any, **kw: Any) -> str:
+    return "(strftime('%Y-%m-%d %H:%M:%f', 'now'))"
 
 
 class DeviceModel(Base):
@@ -35,6 +68,7 @@ class DeviceModel(Base):
     id: Mapped[UUID] = mapped_column(
         PGUUID(as_uuid=True),
         primary_key=True,
+        default=uuid7,
         comment="Unique device identifier (UUID)",
     )
     device_id: Mapped[str] = mapped_column(
@@ -70,13 +104,33 @@ class DeviceModel(Base):
         nullable=True,
         comment="Timestamp of last reading received (UTC)",
     )
+    reading_count: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default=text("0"),
+        comment="Readings accepted for this device, bumped with last_seen_at",
+    )
 
-    # Relationships
+    # Relationships. Never loaded implicitly: query readings through the
+    # repository, or use selectinload(DeviceModel.readings) explicitly.
+    # Deletes are left to the ON DELETE CASCADE foreign key.
     readings: Mapped[list["ReadingModel"]] = relationship(
         "ReadingModel",
         back_populates="device",
-        lazy="dynamic",
+        lazy="raise_on_sql",
         cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    # Partial index: device listings only ever scan active devices
+    __table_args__ = (
+        Index(
+            "ix_devices_active",
+            "device_id",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active"),
+        ),
     )
 
     def to_dict(self) -> dict[str, Any]:
@@ -99,7 +153,8 @@ class ReadingModel(Base):
     ORM model for readings table.
 
     Stores immutable sensor readings with server-assigned timestamps.
-    Append-only - readings are never updated or deleted.
+    Append-only - readings are never updated or deleted. On PostgreSQL
+    with TimescaleDB the table is a hypertable chunked by timestamp.
     """
 
     __tablename__ = "readings"
@@ -107,17 +162,22 @@ class ReadingModel(Base):
     id: Mapped[UUID] = mapped_column(
         PGUUID(as_uuid=True),
         primary_key=True,
+        default=uuid7,
         comment="Unique reading identifier (UUID)",
     )
-    device_id: Mapped[str] = mapped_column(
-        String(64),
-        ForeignKey("devices.device_id", ondelete="CASCADE"),
+    device_uuid: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("devices.id", ondelete="CASCADE"),
         nullable=False,
         comment="Device that produced this reading",
     )
+    # Part of the primary key: hypertable unique constraints must include
+    # the time partitioning column.
     timestamp: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
         nullable=False,
+        server_default=ClockTimestamp(),
         comment="Server-assigned timestamp (UTC)",
     )
 
@@ -144,13 +204,14 @@ class ReadingModel(Base):
         back_populates="readings",
     )
 
-    # Composite index for efficient time-series queries
+    # Covering index: newest-first per device, metrics served from the index
     __table_args__ = (
         Index(
-            "ix_readings_device_timestamp",
-            "device_id",
-            "timestamp",
+            "ix_readings_device_ts_desc",
+            "device_uuid",
+            text("timestamp DESC"),
             postgresql_using="btree",
+            postgresql_include=["temperature", "humidity", "voltage"],
         ),
         Index(
             "ix_readings_timestamp",
@@ -172,10 +233,13 @@ class ReadingModel(Base):
 
         return {
             "id": str(self.id),
-            "device_id": self.device_id,
+            "device_uuid": str(self.device_uuid),
             "timestamp": self.timestamp.isoformat() if self.timestamp else None,
             "metrics": metrics,
         }
 
     def __repr__(self) -> str:
-        return f"ReadingModel(id={self.id}, device_id={self.device_id}, timestamp={self.timestamp})"
+        return (
+            f"ReadingModel(id={self.id}, device_uuid={self.device_uuid}, "
+            f"timestamp={self.timestamp})"
+        )
@@ -5,12 +5,14 @@ Provides async SQLAlchemy engine and session management.
 Uses connection pooling for production workloads.
 """
 
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, AsyncIterator, Callable
 from contextlib import asynccontextmanager
-from typing import Annotated
+from typing import Annotated, Any
 
 from fastapi import Depends
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
@@ -25,6 +27,9 @@ logger = get_logger(__name__)
 # Module-level engine and session factory
 _engine: AsyncEngine | None = None
 _session_factory: async_sessionmaker[AsyncSession] | None = None
+_readonly_session_factory: async_sessionmaker[AsyncSession] | None = None
+# Connection held open to receive NOTIFY messages; see listen()
+_listen_connection: AsyncConnection | None = None
 
 
 async def init_database(settings: Settings | None = None) -> None:
@@ -36,7 +41,7 @@ async def init_database(settings: Settings | None = None) -> None:
     Args:
         settings: Application settings. If None, loads from environment.
     """
-    global _engine, _session_factory
+    global _engine, _session_factory, _readonly_session_factory
 
     if _engine is not None:
         logger.warning("Database already initialized, skipping")
@@ -60,6 +65,7 @@ async def init_database(settings: Settings | None = None) -> None:
             connect_args={"check_same_thread": False},  # Allow SQLite across threads
             echo=settings.debug,  # Log SQL in debug mode
         )
+        event.listen(_engine.sync_engine, "connect", _set_sqlite_pragmas)
     else:
         # PostgreSQL and other databases with full pooling support
         _engine = create_async_engine(
@@ -67,8 +73,11 @@ async def init_database(settings: Settings | None = None) -> None:
             pool_size=settings.db_pool_size,
             max_overflow=settings.db_max_overflow,
             pool_timeout=settings.db_pool_timeout,
-            pool_pre_ping=True,  # Verify connections before use
+            pool_pre_ping=settings.db_pool_pre_ping,
+            pool_recycle=settings.db_pool_recycle,
+            pool_use_lifo=settings.db_pool_use_lifo,  # Keep a small set of connections hot
             echo=settings.debug,  # Log SQL in debug mode
+            connect_args=_asyncpg_connect_args(settings),
         )
 
     _session_factory = async_sessionmaker(
@@ -78,26 +87,135 @@ async def init_database(settings: Settings | None = None) -> None:
         autocommit=False,
         autoflush=False,
     )
+    # Connections are switched to autocommit on checkout and reset on return
+    _readonly_session_factory = async_sessionmaker(
+        bind=_engine.execution_options(isolation_level="AUTOCOMMIT"),
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
 
     logger.info("Database connection initialized successfully")
 
 
+# Applied to every new SQLite connection: WAL lets readers run alongside
+# the single writer, and synchronous=NORMAL only fsyncs at checkpoints.
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """Configure a freshly opened SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _asyncpg_connect_args(settings: Settings) -> dict[str, Any]:
+    """
+    Build asyncpg per-connection arguments.
+
+    SQLAlchemy's asyncpg adapter prepares every statement itself and keeps
+    them in its own per-connection cache, so that cache is the one sized
+    here; asyncpg's internal ``statement_cache_size`` is not used on this
+    path and is left at its default. Repository statements are
+    module-level constants, so repeat calls hit the same SQL text and skip
+    server-side parse/plan.
+
+    JIT is off by default: its compile cost outweighs any gain on the
+    short indexed queries this service runs. Server settings travel in
+    the connection startup packet, so they cost no extra round trip.
+    With ``synchronous_commit`` off a crash can lose the last few
+    hundred milliseconds of commits, but never corrupts data.
+    """
+    if not settings.database_url.startswith("postgresql+asyncpg"):
+        return {}
+    return {
+        "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+        "server_settings": {
+            "application_name": settings.app_name,
+            "jit": "on" if settings.db_jit else "off",
+            "synchronous_commit": "on" if settings.db_synchronous_commit else "off",
+        },
+    }
+
+
+async def listen(channel: str, callback: Callable[[str], None]) -> bool:
+    """
+    Call a function with the payload of every NOTIFY on a channel.
+
+    PostgreSQL (asyncpg) only. One pooled connection is held for all
+    listeners until close_database. Messages arrive when the notifying
+    transaction commits; if the connection drops, later ones are missed,
+    so callers must treat them as a best-effort hint.
+
+    Args:
+        channel: Notification channel name.
+        callback: Called on the event loop with each payload.
+
+    Returns:
+        Whether the channel is being listened to.
+
+    Raises:
+        RuntimeError: If database not initialized.
+    """
+    global _listen_connection
+
+    if _engine is None:
+        raise RuntimeError("Database not initialized. Call init_database() during startup.")
+    if _engine.dialect.driver != "asyncpg":
+        return False
+
+    if _listen_connection is None:
+        _listen_connection = await _engine.connect()
+    raw_connection = await _listen_connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+    if driver_connection is None:
+        raise RuntimeError("Database connection is closed")
+
+    def on_notify(connection: Any, pid: int, channel: str, payload: str) -> None:
+        callback(payload)
+
+    def on_terminate(connection: Any) -> None:
+        logger.warning("Lost database notification connection", channel=channel)
+
+    await driver_connection.add_listener(channel, on_notify)
+    driver_connection.add_termination_listener(on_terminate)
+
+    logger.info("Listening for database notifications", channel=channel)
+    return True
+
+
 async def close_database() -> None:
     """
     Close database connections.
 
     Should be called during application shutdown.
     """
-    global _engine, _session_factory
+    global _engine, _session_factory, _readonly_session_factory, _listen_connection
 
     if _engine is None:
         logger.warning("Database not initialized, nothing to close")
         return
 
     logger.info("Closing database connections")
+    if _listen_connection is not None:
+        # Discard rather than return it: its listeners would stay attached
+        await _listen_connection.invalidate()
+        await _listen_connection.close()
+        _listen_connection = None
     await _engine.dispose()
     _engine = None
     _session_factory = None
+    _readonly_session_factory = None
     logger.info("Database connections closed")
 
 
@@ -123,5 +241,52 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
+async def get_readonly_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get database session for read-only requests.
+
+    Statements run in autocommit mode, so no BEGIN/COMMIT round trips are
+    spent wrapping the request's queries. Server-side cursors need a
+    transaction; streaming reads must use ``get_db_session``.
+
+    Yields:
+        AsyncSession: Database session.
+
+    Raises:
+        RuntimeError: If database not initialized.
+    """
+    if _readonly_session_factory is None:
+        raise RuntimeError("Database not initialized. Call init_database() during startup.")
+
+    async with _readonly_session_factory() as session:
+        yield session
+
+
+@asynccontextmanager
+async def get_db_session_context() -> AsyncIterator[AsyncSession]:
+    """
+    Context manager for database sessions outside of request handlers.
+
+    Used by background tasks such as the batched reading writer.
+
+    Yields:
+        AsyncSession: Database session.
+
+    Raises:
+        RuntimeError: If database not initialized.
+    """
+    if _session_factory is None:
+        raise RuntimeError("Database not initialized. Call init_database() during startup.")
+
+    async with _session_factory() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
 # Type alias for dependency injection
 DatabaseSession = Annotated[AsyncSession, Depends(get_db_session)]
+ReadOnlyDatabaseSession = Annotated[AsyncSession, Depends(get_readonly_db_session)]
@@ -0,0 +1,76 @@
+"""
+Wall-clock timestamps.
+
+Formats UTC timestamps as ISO 8601 with a ``Z`` suffix.
+"""
+
+import time
+from datetime import UTC, datetime
+
+# Formatted date and time of the last whole second seen by iso_now
+_last_sec: int = 0
+_last_prefix: str = ""
+
+
+def iso_now() -> str:
+    """
+    Get the current UTC time as an ISO 8601 string.
+
+    Same shape as ``datetime.utcnow().isoformat() + "Z"`` with
+    microsecond precision. The date and time part is formatted once per
+    second and reused; only the fraction is formatted per call.
+
+    Returns:
+        Timestamp such as ``2024-01-15T10:30:00.123456Z``.
+    """
+    global _last_sec, _last_prefix
+
+    ns = time.time_ns()
+    sec, frac = divmod(ns, 1_000_000_000)
+    if sec != _last_sec:
+        t = time.gmtime(sec)
+        _last_prefix = (
+            f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+            f"T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+        )
+        _last_sec = sec
+
+    return f"{_last_prefix}.{frac // 1000:06d}Z"
+
+
+def as_utc(dt: datetime) -> datetime:
+    """
+    Make a datetime timezone-aware in UTC.
+
+    Naive values are taken to be UTC already; aware values are converted.
+
+    Args:
+        dt: Timestamp to normalize.
+
+    Returns:
+        Aware datetime in UTC.
+    """
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=UTC)
+    return dt.astimezone(UTC)
+
+
+def iso_utc(dt: datetime) -> str:
+    """
+    Format a UTC datetime as an ISO 8601 string.
+
+    Naive values are taken to be UTC already; aware values are converted
+    to UTC, so both render as ``2024-01-15T10:30:00.123456Z``.
+
+    Args:
+        dt: Timestamp to format.
+
+    Returns:
+        ISO 8601 string with a ``Z`` suffix.
+    """
+    if dt.tzinfo is None:
+        return dt.isoformat() + "Z"
+    # Values read from the database are already in UTC; skip converting
+    if dt.tzinfo is not UTC:
+        dt = dt.astimezone(UTC)
+    return dt.isoformat()[:-6] + "Z"
@@ -5,12 +5,20 @@ Represents an IoT device that produces sensor readings.
 Immutable domain entity with business rules.
 """
 
+import re
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Self
-from uuid import UUID, uuid4
+from uuid import UUID
 from enum import Enum
 
+from app.domain.ids import uuid7
+
+# Allowed device identifiers; the API DTOs validate against the same pattern
+DEVICE_ID_PATTERN = r"^[a-zA-Z0-9_-]+$"
+
+_DEVICE_ID_RE = re.compile(DEVICE_ID_PATTERN)
+
 
 @dataclass(frozen=True, slots=True)
 class Device:
@@ -21,13 +29,15 @@ class Device:
     Immutable to ensure domain invariants are preserved.
 
     Attributes:
-        id: Unique device identifier (UUID).
+        id: Unique device identifier (time-ordered UUIDv7).
         device_id: Human-readable device identifier (e.g., "esp32_01").
         name: Optional friendly name for the device.
         api_key_hash: Hashed API key for device authentication.
         is_active: Whether the device is currently active.
         created_at: Timestamp when device was registered (UTC).
         last_seen_at: Timestamp of last reading received (UTC).
+        reading_count: Readings accepted from the device. Counted on ingest,
+            so it can run ahead of stored rows if a batched insert fails.
     """
 
     id: UUID
@@ -37,6 +47,7 @@ class Device:
     is_active: bool
     created_at: datetime
     last_seen_at: datetime | None
+    reading_count: int = 0
 
     @classmethod
     def create(
@@ -67,14 +78,14 @@ class Device:
         if len(device_id) > 64:
             raise ValueError("device_id cannot exceed 64 characters")
 
-        # Only allow alphanumeric, underscore, and hyphen
-        if not all(c.isalnum() or c in "_-" for c in device_id):
+        # Only allow ASCII alphanumerics, underscore, and hyphen
+        if _DEVICE_ID_RE.fullmatch(device_id) is None:
             raise ValueError(
                 "device_id can only contain alphanumeric characters, underscores, and hyphens"
             )
 
         return cls(
-            id=uuid4(),
+            id=uuid7(),
             device_id=device_id.strip(),
             name=name.strip() if name else None,
             api_key_hash=api_key_hash,
@@ -101,6 +112,7 @@ class Device:
             is_active=self.is_active,
             created_at=self.created_at,
             last_seen_at=timestamp,
+            reading_count=self.reading_count,
         )
 
     def deactivate(self) -> Self:
@@ -118,6 +130,7 @@ class Device:
             is_active=False,
             created_at=self.created_at,
             last_seen_at=self.last_seen_at,
+            reading_count=self.reading_count,
         )
 
     def __str__(self) -> str:
@@ -5,11 +5,13 @@ Represents a single sensor reading from an IoT device.
 Immutable and append-only - readings are never modified after creation.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Self
-from uuid import UUID, uuid4
+from typing import Any, Self
+from uuid import UUID
 
+from app.domain.clock import iso_utc
+from app.domain.ids import uuid7
 from app.domain.value_objects.metrics import SensorMetrics
 
 
@@ -22,7 +24,7 @@ class Reading:
     Timestamps are always server-assigned in UTC - never trust client time.
 
     Attributes:
-        id: Unique reading identifier (UUID).
+        id: Unique reading identifier (time-ordered UUIDv7).
         device_id: Reference to the device that produced this reading.
         metrics: Sensor metric values (temperature, humidity, voltage).
         timestamp: Server-assigned UTC timestamp when reading was received.
@@ -33,6 +35,11 @@ class Reading:
     metrics: SensorMetrics
     timestamp: datetime
 
+    # Lazily built result of to_dict; the instance is frozen so it never goes stale
+    _dict: dict[str, Any] | None = field(
+        default=None, init=False, repr=False, compare=False, hash=False
+    )
+
     @classmethod
     def create(
         cls,
@@ -61,7 +68,7 @@ class Reading:
             raise ValueError("device_id cannot be empty")
 
         return cls(
-            id=uuid4(),
+            id=uuid7(),
             device_id=device_id.strip(),
             metrics=metrics,
             timestamp=timestamp or datetime.utcnow(),
@@ -71,15 +78,24 @@ class Reading:
         """
         Convert reading to dictionary for serialization.
 
+        The dictionary is built on first use and shared by later calls,
+        such as the WebSocket broadcast and the ingest response, so
+        callers must not modify it.
+
         Returns:
             Dictionary representation of the reading.
         """
-        return {
+        if self._dict is not None:
+            return self._dict
+
+        result = {
             "id": str(self.id),
             "device_id": self.device_id,
             "metrics": self.metrics.to_dict(),
-            "timestamp": self.timestamp.isoformat() + "Z",
+            "timestamp": iso_utc(self.timestamp),
         }
+        object.__setattr__(self, "_dict", result)
+        return result
 
     def __str__(self) -> str:
         return f"Reading({self.device_id}, {self.timestamp.isoformat()})"
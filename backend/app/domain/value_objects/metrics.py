@@ -5,8 +5,8 @@ Encapsulates sensor measurements with explicit units and validation.
 Immutable to ensure data integrity.
 """
 
-from dataclasses import dataclass
-from typing import Self
+from dataclasses import dataclass, field
+from typing import ClassVar, Self
 
 
 @dataclass(frozen=True, slots=True)
@@ -32,13 +32,18 @@ class SensorMetrics:
     humidity: float | None = None
     voltage: float | None = None
 
+    # Lazily built result of to_dict; the instance is frozen so it never goes stale
+    _dict: dict[str, float] | None = field(
+        default=None, init=False, repr=False, compare=False, hash=False
+    )
+
     # Physical constraints for sensor validation
-    TEMP_MIN: float = -40.0
-    TEMP_MAX: float = 85.0
-    HUMIDITY_MIN: float = 0.0
-    HUMIDITY_MAX: float = 100.0
-    VOLTAGE_MIN: float = 0.0
-    VOLTAGE_MAX: float = 24.0
+    TEMP_MIN: ClassVar[float] = -40.0
+    TEMP_MAX: ClassVar[float] = 85.0
+    HUMIDITY_MIN: ClassVar[float] = 0.0
+    HUMIDITY_MAX: ClassVar[float] = 100.0
+    VOLTAGE_MIN: ClassVar[float] = 0.0
+    VOLTAGE_MAX: ClassVar[float] = 24.0
 
     def __post_init__(self) -> None:
         """Validate metric values are within physical constraints."""
@@ -83,34 +88,67 @@ class SensorMetrics:
             voltage=data.get("voltage"),
         )
 
+    @classmethod
+    def unchecked(
+        cls,
+        temperature: float | None = None,
+        humidity: float | None = None,
+        voltage: float | None = None,
+    ) -> Self:
+        """
+        Create metrics without range validation.
+
+        Only for values that were already validated against these limits,
+        such as readings loaded from the database or a parsed MetricsDTO.
+        Any other external input must go through the regular constructor.
+
+        Args:
+            temperature: Temperature in degrees Celsius.
+            humidity: Relative humidity percentage.
+            voltage: Battery/power voltage in volts.
+
+        Returns:
+            New SensorMetrics instance.
+        """
+        obj = object.__new__(cls)
+        object.__setattr__(obj, "temperature", temperature)
+        object.__setattr__(obj, "humidity", humidity)
+        object.__setattr__(obj, "voltage", voltage)
+        object.__setattr__(obj, "_dict", None)
+        return obj
+
     def to_dict(self) -> dict:
         """
         Convert to dictionary, excluding None values.
 
+        The dictionary is built on first use and shared by later calls,
+        so callers must not modify it.
+
         Returns:
             Dictionary with only non-None metric values.
         """
-        result = {}
+        if self._dict is not None:
+            return self._dict
+
+        result: dict[str, float] = {}
         if self.temperature is not None:
             result["temperature"] = self.temperature
         if self.humidity is not None:
             result["humidity"] = self.humidity
         if self.voltage is not None:
             result["voltage"] = self.voltage
+        object.__setattr__(self, "_dict", result)
         return result
 
     @property
     def has_any_metric(self) -> bool:
         """Check if at least one metric is present."""
-        return any(
-            [
-                self.temperature is not None,
-                self.humidity is not None,
-                self.voltage is not None,
-            ]
-        )
+        return self.temperature is not None or self.humidity is not None or self.voltage is not None
 
     def __str__(self) -> str:
+        if not self.has_any_metric:
+            return "Metrics(empty)"
+
         parts = []
         if self.temperature is not None:
             parts.append(f"temp={self.temperature}°C")
@@ -118,4 +156,4 @@ class SensorMetrics:
             parts.append(f"humidity={self.humidity}%")
         if self.voltage is not None:
             parts.append(f"voltage={self.voltage}V")
-        return f"Metrics({', '.join(parts) or 'empty'})"
+        return f"Metrics({', '.join(parts)})"
@@ -6,9 +6,14 @@ Represents a validated time range for querying historical data.
 
 import re
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 from typing import Self
 
+_DURATION_RE = re.compile(r"^(\d+)([hdmw])$")
+
+# Seconds per duration unit
+_UNIT_SECONDS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+
 
 @dataclass(frozen=True, slots=True)
 class TimeRange:
@@ -46,11 +51,10 @@ class TimeRange:
         Raises:
             ValueError: If duration string format is invalid.
         """
-        now = now or datetime.utcnow()
+        now = now or datetime.now(UTC)
 
         # Parse duration string
-        pattern = r"^(\d+)([hdmw])$"
-        match = re.match(pattern, duration_str.lower())
+        match = _DURATION_RE.match(duration_str.lower())
 
         if not match:
             raise ValueError(
@@ -60,24 +64,22 @@ class TimeRange:
             )
 
         value = int(match.group(1))
-        unit = match.group(2)
 
         if value <= 0:
             raise ValueError(f"Duration must be positive: {value}")
 
-        # Calculate delta based on unit
-        if unit == "m":
-            delta = timedelta(minutes=value)
-        elif unit == "h":
-            delta = timedelta(hours=value)
-        elif unit == "d":
-            delta = timedelta(days=value)
-        elif unit == "w":
-            delta = timedelta(weeks=value)
-        else:
-            raise ValueError(f"Unknown time unit: {unit}")
-
-        return cls(start=now - delta, end=now)
+        delta = timedelta(seconds=value * _UNIT_SECONDS[match.group(2)])
+
+        # A positive delta already guarantees start < end
+        return cls._unchecked(now - delta, now)
+
+    @classmethod
+    def _unchecked(cls, start: datetime, end: datetime) -> Self:
+        """Create a time range whose ordering the caller already guarantees."""
+        obj = object.__new__(cls)
+        object.__setattr__(obj, "start", start)
+        object.__setattr__(obj, "end", end)
+        return obj
 
     @classmethod
     def between(cls, start: datetime, end: datetime) -> Self:
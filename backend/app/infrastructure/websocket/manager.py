@@ -5,15 +5,29 @@ Handles WebSocket connections, subscriptions, and fan-out broadcasting.
 """
 
 import asyncio
-from typing import Any
+from typing import Any, NamedTuple
 
-from fastapi import WebSocket
-from starlette.websockets import WebSocketState
+import orjson
+from fastapi import WebSocket, status
 
 from app.config.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Subscription key of connections streaming every device's readings
+ALL_DEVICES = "__all__"
+
+_NO_SUBSCRIBERS: frozenset[WebSocket] = frozenset()
+
+
+class _Connection(NamedTuple):
+    """Per-connection state: subscriptions and the outbound frame queue."""
+
+    # device_id -> that device's subscriber set, so leaving needs no lookup
+    subscriptions: dict[str, set[WebSocket]]
+    outbox: asyncio.Queue[str]
+    writer: asyncio.Task[None]
+
 
 class WebSocketManager:
     """
@@ -24,21 +38,33 @@ class WebSocketManager:
     - Device-specific subscriptions
     - Efficient fan-out broadcasting
     - Graceful error handling
+
+    Each connection owns a bounded queue drained by its own writer task,
+    so broadcasting only enqueues frames and a slow client holds up
+    nobody but itself. A client whose queue fills is disconnected.
     """
 
-    def __init__(self) -> None:
-        """Initialize WebSocket manager."""
-        # Map of device_id -> set of WebSocket connections
+    def __init__(self, max_queued_frames: int = 256) -> None:
+        """
+        Initialize WebSocket manager.
+
+        Args:
+            max_queued_frames: Frames a connection may have waiting to be
+                sent before it is dropped as too slow.
+        """
+        # Map of device_id -> WebSocket connections. Updates contain no
+        # await, so they are atomic on the event loop and need no lock.
         self._device_subscribers: dict[str, set[WebSocket]] = {}
-        # Map of WebSocket -> set of subscribed device_ids
-        self._connection_subscriptions: dict[WebSocket, set[str]] = {}
-        # Lock for thread-safe operations
-        self._lock = asyncio.Lock()
+        # Map of WebSocket -> its subscriptions and writer
+        self._connections: dict[WebSocket, _Connection] = {}
+        self._max_queued_frames = max_queued_frames
+        # Close handshakes of evicted clients still in flight
+        self._closing: set[asyncio.Task[None]] = set()
 
     @property
     def connection_count(self) -> int:
         """Get total number of active connections."""
-        return len(self._connection_subscriptions)
+        return len(self._connections)
 
     @property
     def subscription_count(self) -> int:
@@ -54,8 +80,9 @@ class WebSocketManager:
         """
         await websocket.accept()
 
-        async with self._lock:
-            self._connection_subscriptions[websocket] = set()
+        outbox: asyncio.Queue[str] = asyncio.Queue(maxsize=self._max_queued_frames)
+        writer = asyncio.create_task(self._write(websocket, outbox))
+        self._connections[websocket] = _Connection({}, outbox, writer)
 
         logger.info(
             "WebSocket connected",
@@ -71,24 +98,54 @@ class WebSocketManager:
         Args:
             websocket: WebSocket connection that disconnected.
         """
-        async with self._lock:
-            # Get all subscribed device IDs
-            subscribed_devices = self._connection_subscriptions.pop(websocket, set())
+        self._drop(websocket)
 
-            # Remove from each device's subscriber set
-            for device_id in subscribed_devices:
-                if device_id in self._device_subscribers:
-                    self._device_subscribers[device_id].discard(websocket)
-                    # Clean up empty sets
-                    if not self._device_subscribers[device_id]:
-                        del self._device_subscribers[device_id]
+    def _drop(self, websocket: WebSocket) -> None:
+        """Forget a connection: stop its writer and remove its subscriptions."""
+        connection = self._connections.pop(websocket, None)
+        if connection is None:
+            return
+
+        connection.writer.cancel()
+        for device_id, subscribers in connection.subscriptions.items():
+            subscribers.discard(websocket)
+            if not subscribers:
+                del self._device_subscribers[device_id]
 
         logger.info(
             "WebSocket disconnected",
             connections=self.connection_count,
-            unsubscribed_devices=len(subscribed_devices),
+            unsubscribed_devices=len(connection.subscriptions),
         )
 
+    async def _write(self, websocket: WebSocket, outbox: asyncio.Queue[str]) -> None:
+        """Send a connection's queued frames in order until it fails."""
+        while True:
+            frame = await outbox.get()
+            try:
+                await websocket.send_text(frame)
+            except Exception as e:
+                logger.warning("Failed to send to WebSocket subscriber", error=str(e))
+                self._drop(websocket)
+                return
+
+    def _evict(self, websocket: WebSocket) -> None:
+        """Drop a client that cannot keep up and close its socket."""
+        logger.warning("Dropping slow WebSocket subscriber")
+        self._drop(websocket)
+
+        task = asyncio.create_task(self._close(websocket))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close(websocket: WebSocket) -> None:
+        """Close a socket, ignoring one that is already gone."""
+        try:
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        except Exception as e:
+            logger.debug("Failed to close WebSocket", error=str(e))
+
     async def subscribe(self, websocket: WebSocket, device_id: str) -> None:
         """
         Subscribe a connection to a device's updates.
@@ -97,20 +154,21 @@ class WebSocketManager:
             websocket: WebSocket connection.
             device_id: Device to subscribe to.
         """
-        async with self._lock:
-            # Add to device subscribers
-            if device_id not in self._device_subscribers:
-                self._device_subscribers[device_id] = set()
-            self._device_subscribers[device_id].add(websocket)
+        connection = self._connections.get(websocket)
+        if connection is None:
+            return
+
+        # Add to device subscribers
+        subscribers = self._device_subscribers.setdefault(device_id, set())
+        subscribers.add(websocket)
 
-            # Track subscription for this connection
-            if websocket in self._connection_subscriptions:
-                self._connection_subscriptions[websocket].add(device_id)
+        # Track subscription for this connection
+        connection.subscriptions[device_id] = subscribers
 
         logger.debug(
             "WebSocket subscribed to device",
             device_id=device_id,
-            subscriber_count=len(self._device_subscribers.get(device_id, set())),
+            subscriber_count=len(subscribers),
         )
 
     async def unsubscribe(self, websocket: WebSocket, device_id: str) -> None:
@@ -121,65 +179,75 @@ class WebSocketManager:
             websocket: WebSocket connection.
             device_id: Device to unsubscribe from.
         """
-        async with self._lock:
-            if device_id in self._device_subscribers:
-                self._device_subscribers[device_id].discard(websocket)
-                if not self._device_subscribers[device_id]:
-                    del self._device_subscribers[device_id]
+        connection = self._connections.get(websocket)
+        if connection is None:
+            return
 
-            if websocket in self._connection_subscriptions:
-                self._connection_subscriptions[websocket].discard(device_id)
+        subscribers = connection.subscriptions.pop(device_id, None)
+        if subscribers is not None:
+            subscribers.discard(websocket)
+            if not subscribers:
+                del self._device_subscribers[device_id]
 
         logger.debug("WebSocket unsubscribed from device", device_id=device_id)
 
-    async def broadcast_to_device(self, device_id: str, message: dict[str, Any]) -> None:
+    def publish_to_device(self, device_id: str, message: dict[str, Any]) -> None:
         """
-        Broadcast a message to all subscribers of a device.
+        Queue a message for a device's subscribers without waiting.
+
+        Lets callers such as ingestion respond without being held up by
+        slow subscribers: frames are only enqueued, and each connection's
+        writer sends them. Nothing is encoded when nobody is subscribed.
 
         Args:
             device_id: Device to broadcast for.
             message: Message payload to send.
         """
-        async with self._lock:
-            subscribers = self._device_subscribers.get(device_id, set()).copy()
+        device_subs = self._device_subscribers.get(device_id, _NO_SUBSCRIBERS)
+        all_subs = self._device_subscribers.get(ALL_DEVICES, _NO_SUBSCRIBERS)
+        if not all_subs:
+            subscribers = device_subs
+        elif not device_subs:
+            subscribers = all_subs
+        else:
+            subscribers = device_subs | all_subs
 
         if not subscribers:
             return
 
-        # Send to all subscribers concurrently
-        disconnected: list[WebSocket] = []
+        frame = orjson.dumps({"type": "reading", "device_id": device_id, "data": message}).decode()
 
-        async def send_to_subscriber(ws: WebSocket) -> None:
+        # Evict after the loop; dropping a client edits these sets
+        slow = []
+        for ws in subscribers:
             try:
-                if ws.client_state == WebSocketState.CONNECTED:
-                    await ws.send_json(
-                        {
-                            "type": "reading",
-                            "device_id": device_id,
-                            "data": message,
-                        }
-                    )
-            except Exception as e:
-                logger.warning(
-                    "Failed to send to WebSocket subscriber",
-                    error=str(e),
-                    device_id=device_id,
-                )
-                disconnected.append(ws)
-
-        await asyncio.gather(*[send_to_subscriber(ws) for ws in subscribers])
-
-        # Clean up disconnected clients
-        for ws in disconnected:
-            await self.disconnect(ws)
+                self._connections[ws].outbox.put_nowait(frame)
+            except asyncio.QueueFull:
+                slow.append(ws)
 
         logger.debug(
             "Broadcast to device subscribers",
             device_id=device_id,
             subscriber_count=len(subscribers),
-            failed=len(disconnected),
+            evicted=len(slow),
         )
 
+        for ws in slow:
+            self._evict(ws)
+
+    async def broadcast_to_device(self, device_id: str, message: dict[str, Any]) -> None:
+        """
+        Broadcast a message to all subscribers of a device.
+
+        Subscribers of the device and of the all-devices stream receive
+        the same frame, which is serialized once for every recipient.
+
+        Args:
+            device_id: Device to broadcast for.
+            message: Message payload to send.
+        """
+        self.publish_to_device(device_id, message)
+
     async def send_error(self, websocket: WebSocket, error: str, code: str) -> None:
         """
         Send an error message to a WebSocket connection.
@@ -189,15 +257,17 @@ class WebSocketManager:
             error: Error message.
             code: Error code.
         """
+        # A closed socket raises, which is cheaper than checking every send
         try:
-            if websocket.client_state == WebSocketState.CONNECTED:
-                await websocket.send_json(
+            await websocket.send_text(
+                orjson.dumps(
                     {
                         "type": "error",
                         "error": error,
                         "code": code,
                     }
-                )
+                ).decode()
+            )
         except Exception as e:
             logger.warning("Failed to send error to WebSocket", error=str(e))
 
@@ -210,12 +280,13 @@ class WebSocketManager:
             message: Acknowledgment message.
         """
         try:
-            if websocket.client_state == WebSocketState.CONNECTED:
-                await websocket.send_json(
+            await websocket.send_text(
+                orjson.dumps(
                     {
                         "type": "ack",
                         "message": message,
                     }
-                )
+                ).decode()
+            )
         except Exception as e:
             logger.warning("Failed to send ack to WebSocket", error=str(e))
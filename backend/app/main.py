@@ -13,13 +13,16 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from app.api.dependencies import get_device_cache, get_reading_writer
 from app.api.devices import router as devices_router
 from app.api.health import router as health_router
 from app.api.ingest import router as ingest_router
 from app.api.realtime import router as realtime_router
 from app.config.logging import get_logger, setup_logging
 from app.config.settings import get_settings
-from app.db import close_database, init_database
+from app.db import close_database, init_database, listen
+from app.repositories.device_repository import DEVICE_DEACTIVATED_CHANNEL
+from app.services.device_service import DeviceError, DeviceExistsError, DeviceNotFoundError
 
 # Initialize settings and logging
 settings = get_settings()
@@ -33,8 +36,9 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     Application lifespan manager.
 
     Handles startup and shutdown events:
-    - Startup: Initialize database connection pool
-    - Shutdown: Close database connections gracefully
+    - Startup: Initialize database connection pool, listen for device
+      deactivations, start reading writer
+    - Shutdown: Flush pending readings, close database connections gracefully
     """
     # Startup
     logger.info(
@@ -45,11 +49,15 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     try:
         await init_database(settings)
+        # Drop devices deactivated through other workers from this one's cache
+        await listen(DEVICE_DEACTIVATED_CHANNEL, (await get_device_cache()).invalidate)
+        await get_reading_writer().start()
         logger.info("Application startup complete")
         yield
     finally:
         # Shutdown
         logger.info("Shutting down Telemetry Backend")
+        await get_reading_writer().stop()
         await close_database()
         logger.info("Application shutdown complete")
 
@@ -83,14 +91,16 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"] if not settings.is_production else [],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# CORS middleware. Production allows no cross-origin callers, so there it
+# would only add a layer to every request.
+if not settings.is_production:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
 
 
 # Exception handlers
@@ -128,6 +138,30 @@ async def validation_exception_handler(
     )
 
 
+# Status code per DeviceError code
+_DEVICE_ERROR_STATUS = {
+    DeviceExistsError.code: status.HTTP_409_CONFLICT,
+    DeviceNotFoundError.code: status.HTTP_404_NOT_FOUND,
+}
+
+
+@app.exception_handler(DeviceError)
+async def device_exception_handler(
+    request: Request,
+    exc: DeviceError,
+) -> JSONResponse:
+    """Handle device errors with consistent format."""
+    return JSONResponse(
+        status_code=_DEVICE_ERROR_STATUS[exc.code],
+        content={
+            "success": False,
+            "error": exc.message,
+            "code": exc.code,
+            "device_id": exc.device_id,
+        },
+    )
+
+
 @app.exception_handler(Exception)
 async def general_exception_handler(
     request: Request,
@@ -6,9 +6,12 @@ Abstracts persistence details from the service layer.
 """
 
 from datetime import datetime
+from typing import Any, cast
 from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import Table, bindparam, exists, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.logging import get_logger
@@ -17,6 +20,57 @@ from app.db import DeviceModel
 
 logger = get_logger(__name__)
 
+# Hot-path statements, built once and parameterized with bind params
+_BY_DEVICE_ID_STMT = select(DeviceModel).where(DeviceModel.device_id == bindparam("device_id"))
+
+_BY_DEVICE_IDS_STMT = select(DeviceModel).where(
+    DeviceModel.device_id.in_(bindparam("device_ids", expanding=True))
+)
+
+# The database answers with a boolean instead of sending back the row's key
+_EXISTS_STMT = select(exists().where(DeviceModel.device_id == bindparam("device_id")))
+
+# Insert unless the device_id is taken, in one round trip and without a
+# check-then-insert race; a conflict inserts nothing and returns no row
+_CREATE_IF_ABSENT_STMTS = {
+    dialect: dialect_insert(DeviceModel)
+    .on_conflict_do_nothing(index_elements=[DeviceModel.device_id])
+    .returning(DeviceModel.id)
+    for dialect, dialect_insert in (("postgresql", pg_insert), ("sqlite", sqlite_insert))
+}
+
+# PostgreSQL NOTIFY channel announcing deactivated device_ids, so every
+# worker can drop them from its ingest device cache
+DEVICE_DEACTIVATED_CHANNEL = "device_deactivated"
+
+_NOTIFY_STMT = select(func.pg_notify(bindparam("channel"), bindparam("payload")))
+
+_EXISTING_IDS_STMT = select(DeviceModel.device_id).where(
+    DeviceModel.device_id.in_(bindparam("device_ids", expanding=True))
+)
+
+_UPDATE_LAST_SEEN_STMT = (
+    update(DeviceModel)
+    .where(DeviceModel.device_id == bindparam("target_device_id"))
+    .values(
+        last_seen_at=bindparam("seen_at"),
+        reading_count=DeviceModel.reading_count + 1,
+    )
+)
+
+# Core table update, so a list of parameter sets runs as one executemany
+# instead of the ORM's bulk update by primary key
+_devices = cast(Table, DeviceModel.__table__)
+
+_RECORD_READINGS_STMT = (
+    update(_devices)
+    .where(_devices.c.id == bindparam("device_pk"))
+    .values(
+        last_seen_at=bindparam("seen_at"),
+        reading_count=_devices.c.reading_count + bindparam("readings"),
+    )
+)
+
 
 class DeviceRepository:
     """
@@ -45,8 +99,7 @@ class DeviceRepository:
         Returns:
             Device entity if found, None otherwise.
         """
-        stmt = select(DeviceModel).where(DeviceModel.device_id == device_id)
-        result = await self._session.execute(stmt)
+        result = await self._session.execute(_BY_DEVICE_ID_STMT, {"device_id": device_id})
         model = result.scalar_one_or_none()
 
         if model is None:
@@ -54,6 +107,22 @@ class DeviceRepository:
 
         return self._to_entity(model)
 
+    async def get_many_by_id(self, device_ids: list[str]) -> dict[str, Device]:
+        """
+        Get several devices by device_id in one query.
+
+        Args:
+            device_ids: Human-readable device identifiers.
+
+        Returns:
+            Found devices keyed by device_id; unknown ids are absent.
+        """
+        if not device_ids:
+            return {}
+
+        result = await self._session.execute(_BY_DEVICE_IDS_STMT, {"device_ids": device_ids})
+        return {model.device_id: self._to_entity(model) for model in result.scalars()}
+
     async def get_by_uuid(self, id: UUID) -> Device | None:
         """
         Get device by UUID.
@@ -93,6 +162,34 @@ class DeviceRepository:
 
         return [self._to_entity(model) for model in models]
 
+    async def get_list_version(
+        self, include_inactive: bool = False
+    ) -> tuple[int, datetime | None, datetime | None]:
+        """
+        Get values that change whenever the device list changes.
+
+        Registration, deactivation and ingestion each move at least one
+        of them, so they can validate a cached device list cheaply.
+
+        Args:
+            include_inactive: If True, includes deactivated devices.
+
+        Returns:
+            Device count, latest last_seen_at and latest created_at.
+        """
+        stmt = select(
+            func.count(DeviceModel.id),
+            func.max(DeviceModel.last_seen_at),
+            func.max(DeviceModel.created_at),
+        )
+
+        if not include_inactive:
+            stmt = stmt.where(DeviceModel.is_active.is_(True))
+
+        result = await self._session.execute(stmt)
+        count, last_seen_at, created_at = result.one()
+        return count, last_seen_at, created_at
+
     async def exists(self, device_id: str) -> bool:
         """
         Check if device exists.
@@ -103,9 +200,7 @@ class DeviceRepository:
         Returns:
             True if device exists, False otherwise.
         """
-        stmt = select(DeviceModel.id).where(DeviceModel.device_id == device_id)
-        result = await self._session.execute(stmt)
-        return result.scalar_one_or_none() is not None
+        return bool(await self._session.scalar(_EXISTS_STMT, {"device_id": device_id}))
 
     async def create(self, device: Device) -> Device:
         """
@@ -128,6 +223,7 @@ class DeviceRepository:
             is_active=device.is_active,
             created_at=device.created_at,
             last_seen_at=device.last_seen_at,
+            reading_count=device.reading_count,
         )
 
         self._session.add(model)
@@ -136,26 +232,101 @@ class DeviceRepository:
         logger.info("Device created", device_id=device.device_id)
         return device
 
+    async def create_if_absent(self, device: Device) -> Device | None:
+        """
+        Create a device unless its device_id is already registered.
+
+        Args:
+            device: Device entity to persist.
+
+        Returns:
+            The created Device entity, or None if the device_id exists.
+        """
+        stmt = _CREATE_IF_ABSENT_STMTS.get(self._session.get_bind().dialect.name)
+        if stmt is None:
+            if await self.exists(device.device_id):
+                return None
+            return await self.create(device)
+
+        result = await self._session.execute(stmt, self._to_row(device))
+        if result.scalar_one_or_none() is None:
+            return None
+
+        logger.info("Device created", device_id=device.device_id)
+        return device
+
+    async def existing_ids(self, device_ids: list[str]) -> set[str]:
+        """
+        Find which of several device_ids are already registered, in one query.
+
+        Args:
+            device_ids: Human-readable device identifiers.
+
+        Returns:
+            The device_ids that exist.
+        """
+        if not device_ids:
+            return set()
+
+        result = await self._session.execute(_EXISTING_IDS_STMT, {"device_ids": device_ids})
+        return set(result.scalars())
+
+    async def create_many(self, devices: list[Device]) -> None:
+        """
+        Create several devices with one multi-row INSERT.
+
+        Args:
+            devices: Device entities to persist.
+
+        Raises:
+            IntegrityError: If any device_id already exists.
+        """
+        await self._session.execute(
+            insert(DeviceModel), [self._to_row(device) for device in devices]
+        )
+
+        logger.info("Devices created", count=len(devices))
+
     async def update_last_seen(self, device_id: str, timestamp: datetime) -> None:
         """
-        Update device's last_seen_at timestamp.
+        Update device's last_seen_at timestamp and count the new reading.
 
         Args:
             device_id: Human-readable device identifier.
             timestamp: New last seen timestamp (UTC).
         """
-        stmt = (
-            update(DeviceModel)
-            .where(DeviceModel.device_id == device_id)
-            .values(last_seen_at=timestamp)
+        await self._session.execute(
+            _UPDATE_LAST_SEEN_STMT, {"target_device_id": device_id, "seen_at": timestamp}
         )
-        await self._session.execute(stmt)
         logger.debug("Updated last_seen_at", device_id=device_id, timestamp=timestamp)
 
+    async def record_readings(self, seen: list[tuple[UUID, datetime, int]]) -> None:
+        """
+        Update last_seen_at and reading counts of several devices at once.
+
+        Args:
+            seen: Device primary key, newest reading timestamp (UTC) and
+                number of new readings, per device.
+        """
+        if not seen:
+            return
+
+        await self._session.execute(
+            _RECORD_READINGS_STMT,
+            [
+                {"device_pk": device_pk, "seen_at": timestamp, "readings": count}
+                for device_pk, timestamp, count in seen
+            ],
+        )
+        logger.debug("Updated last_seen_at", devices=len(seen))
+
     async def deactivate(self, device_id: str) -> bool:
         """
         Deactivate a device.
 
+        On PostgreSQL, also notifies DEVICE_DEACTIVATED_CHANNEL with the
+        device_id.
+
         Args:
             device_id: Human-readable device identifier.
 
@@ -166,10 +337,29 @@ class DeviceRepository:
         result = await self._session.execute(stmt)
 
         if result.rowcount > 0:
+            if self._session.get_bind().dialect.name == "postgresql":
+                # Delivered to listeners when this transaction commits
+                await self._session.execute(
+                    _NOTIFY_STMT, {"channel": DEVICE_DEACTIVATED_CHANNEL, "payload": device_id}
+                )
             logger.info("Device deactivated", device_id=device_id)
             return True
         return False
 
+    @staticmethod
+    def _to_row(device: Device) -> dict[str, Any]:
+        """Convert a domain entity to insert parameters."""
+        return {
+            "id": device.id,
+            "device_id": device.device_id,
+            "name": device.name,
+            "api_key_hash": device.api_key_hash,
+            "is_active": device.is_active,
+            "created_at": device.created_at,
+            "last_seen_at": device.last_seen_at,
+            "reading_count": device.reading_count,
+        }
+
     @staticmethod
     def _to_entity(model: DeviceModel) -> Device:
         """Convert ORM model to domain entity."""
@@ -181,4 +371,5 @@ class DeviceRepository:
             is_active=model.is_active,
             created_at=model.created_at,
             last_seen_at=model.last_seen_at,
+            reading_count=model.reading_count,
         )
@@ -5,19 +5,315 @@ Handles all database operations for sensor readings.
 Optimized for time-series append operations and range queries.
 """
 
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime, timedelta
 from typing import Any
-
-from sqlalchemy import func, select
+from uuid import UUID
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Executable,
+    Float,
+    Integer,
+    Row,
+    String,
+    and_,
+    bindparam,
+    cast,
+    column,
+    func,
+    insert,
+    or_,
+    select,
+    table,
+    union_all,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
 
 from app.config.logging import get_logger
+from app.domain.clock import iso_utc
 from app.domain.entities.reading import Reading
 from app.domain.value_objects.metrics import SensorMetrics
 from app.domain.value_objects.time_range import TimeRange
-from app.db import ReadingModel
+from app.db import DeviceModel, ReadingModel
 
 logger = get_logger(__name__)
 
+# Statements are built once and parameterized with bind params so each call
+# reuses the compiled form instead of rebuilding the expression tree.
+
+# Devices primary key for the device_id bind param; lets range queries
+# filter on the (device_uuid, timestamp) index in a single round trip.
+_DEVICE_PK = (
+    select(DeviceModel.id).where(DeviceModel.device_id == bindparam("device_id")).scalar_subquery()
+)
+
+_IN_RANGE = (
+    ReadingModel.device_uuid == _DEVICE_PK,
+    ReadingModel.timestamp >= bindparam("start"),
+    ReadingModel.timestamp <= bindparam("end"),
+)
+
+# Returns server-assigned timestamps in the order rows were passed
+_INSERT_STMT = insert(ReadingModel).returning(ReadingModel.timestamp, sort_by_parameter_order=True)
+
+# Reads select plain columns rather than ReadingModel, sparing ORM
+# instance and identity-map work for rows that only become entities
+_READING_COLUMNS = (
+    ReadingModel.id,
+    ReadingModel.timestamp,
+    ReadingModel.temperature,
+    ReadingModel.humidity,
+    ReadingModel.voltage,
+)
+
+_LATEST_STMT = (
+    select(*_READING_COLUMNS)
+    .where(ReadingModel.device_uuid == _DEVICE_PK)
+    .order_by(ReadingModel.timestamp.desc())
+    .limit(1)
+)
+
+# Per-device reads either start from the devices row or carry its key, so
+# one query also tells an unknown device (no rows / NULL key) apart from a
+# device with no readings, sparing callers a separate existence check.
+_DEVICE_BY_ID = DeviceModel.device_id == bindparam("device_id")
+
+_HISTORY_STMT = (
+    select(DeviceModel.id.label("device_uuid"), *_READING_COLUMNS)
+    .outerjoin(
+        ReadingModel,
+        and_(
+            ReadingModel.device_uuid == DeviceModel.id,
+            ReadingModel.timestamp >= bindparam("start"),
+            ReadingModel.timestamp <= bindparam("end"),
+        ),
+    )
+    .where(_DEVICE_BY_ID)
+    .order_by(ReadingModel.timestamp.asc())
+    .limit(bindparam("limit", type_=Integer))
+)
+
+# Columns sent by copy_insert; the timestamp is left to its default
+_COPY_COLUMNS = ("id", "device_uuid", "temperature", "humidity", "voltage")
+
+
+class _IsoUtc(FunctionElement[str]):
+    """
+    A timestamp as ISO 8601 UTC text, formatted by the database.
+
+    PostgreSQL only. Always carries six fractional digits, where
+    ``iso_utc`` drops them for whole seconds.
+    """
+
+    type = String()
+    inherit_cache = True
+
+
+@compiles(_IsoUtc, "postgresql")
+def _compile_iso_utc_pg(element: _IsoUtc, compiler: Any, **kw: Any) -> str:
+    return (
+        f"to_char({compiler.process(element.clauses, **kw)} AT TIME ZONE 'UTC', "
+        """'YYYY-MM-DD"T"HH24:MI:SS.US"Z"')"""
+    )
+
+
+# Streamed history skips ORM instances: plain columns, encoded per row
+_HISTORY_ROW_COLUMNS = (
+    DeviceModel.id.label("device_uuid"),
+    ReadingModel.id,
+    ReadingModel.temperature,
+    ReadingModel.humidity,
+    ReadingModel.voltage,
+)
+
+_HISTORY_ROWS_STMT = _HISTORY_STMT.with_only_columns(*_HISTORY_ROW_COLUMNS, ReadingModel.timestamp)
+
+# On PostgreSQL the timestamp arrives as text, sparing a datetime decode
+# and an isoformat per row
+_HISTORY_ISO_ROWS_STMT = _HISTORY_STMT.with_only_columns(
+    *_HISTORY_ROW_COLUMNS, _IsoUtc(ReadingModel.timestamp).label("timestamp")
+)
+
+_STATS_STMT = select(
+    func.count(ReadingModel.id).label("count"),
+    func.min(ReadingModel.timestamp).label("first_reading"),
+    func.max(ReadingModel.timestamp).label("last_reading"),
+    # Temperature stats
+    func.min(ReadingModel.temperature).label("temp_min"),
+    func.max(ReadingModel.temperature).label("temp_max"),
+    func.avg(ReadingModel.temperature).label("temp_avg"),
+    # Humidity stats
+    func.min(ReadingModel.humidity).label("humidity_min"),
+    func.max(ReadingModel.humidity).label("humidity_max"),
+    func.avg(ReadingModel.humidity).label("humidity_avg"),
+    # Voltage stats
+    func.min(ReadingModel.voltage).label("voltage_min"),
+    func.max(ReadingModel.voltage).label("voltage_max"),
+    func.avg(ReadingModel.voltage).label("voltage_avg"),
+    # NULL when the device does not exist
+    _DEVICE_PK.label("device_uuid"),
+).where(*_IN_RANGE)
+
+_COUNT_STMT = select(func.count(ReadingModel.id)).where(ReadingModel.device_uuid == _DEVICE_PK)
+
+# Newest reading id per device, correlated to the outer devices row. A
+# portable stand-in for LATERAL / DISTINCT ON that still walks the
+# (device_uuid, timestamp DESC) index once per device.
+_NEWEST_READING_ID = (
+    select(ReadingModel.id)
+    .where(ReadingModel.device_uuid == DeviceModel.id)
+    .order_by(ReadingModel.timestamp.desc())
+    .limit(1)
+    .correlate(DeviceModel)
+    .scalar_subquery()
+)
+
+_LATEST_PER_DEVICE_STMT = select(DeviceModel.device_id, *_READING_COLUMNS).join(
+    ReadingModel,
+    and_(ReadingModel.device_uuid == DeviceModel.id, ReadingModel.id == _NEWEST_READING_ID),
+)
+
+_LATEST_WITH_DEVICE_STMT = (
+    select(DeviceModel.id.label("device_uuid"), *_READING_COLUMNS)
+    .outerjoin(
+        ReadingModel,
+        and_(ReadingModel.device_uuid == DeviceModel.id, ReadingModel.id == _NEWEST_READING_ID),
+    )
+    .where(_DEVICE_BY_ID)
+)
+
+# TimescaleDB continuous aggregates (see the readings rollups migration).
+# Each bucket stores partial aggregates that re-aggregate exactly.
+_METRICS = ("temp", "humidity", "voltage")
+
+
+def _rollup_view(name: str) -> Any:
+    return table(
+        name,
+        column("device_uuid"),
+        column("bucket", DateTime(timezone=True)),
+        column("reading_count", BigInteger),
+        column("first_reading", DateTime(timezone=True)),
+        column("last_reading", DateTime(timezone=True)),
+        *(
+            column(f"{metric}_{part}", BigInteger if part == "count" else Float)
+            for metric in _METRICS
+            for part in ("min", "max", "sum", "count")
+        ),
+    )
+
+
+def _rollup_partials(view: Any, *bucket_ranges: tuple[str, str]) -> Any:
+    """Re-aggregate rollup buckets falling in the named bind param ranges."""
+    return select(
+        func.sum(view.c.reading_count).label("reading_count"),
+        func.min(view.c.first_reading).label("first_reading"),
+        func.max(view.c.last_reading).label("last_reading"),
+        *(
+            agg(view.c[f"{metric}_{part}"]).label(f"{metric}_{part}")
+            for metric in _METRICS
+            for part, agg in (
+                ("min", func.min),
+                ("max", func.max),
+                ("sum", func.sum),
+                ("count", func.sum),
+            )
+        ),
+    ).where(
+        view.c.device_uuid == _DEVICE_PK,
+        or_(
+            *(
+                and_(view.c.bucket >= bindparam(lo), view.c.bucket < bindparam(hi))
+                for lo, hi in bucket_ranges
+            )
+        ),
+    )
+
+
+_READINGS_1M = _rollup_view("readings_1m")
+_READINGS_1H = _rollup_view("readings_1h")
+
+# Raw readings in the partial minutes at either end of the range
+_RAW_PARTIALS = select(
+    func.count(ReadingModel.id).label("reading_count"),
+    func.min(ReadingModel.timestamp).label("first_reading"),
+    func.max(ReadingModel.timestamp).label("last_reading"),
+    *(
+        agg(col).label(f"{metric}_{part}")
+        for metric, col in zip(
+            _METRICS,
+            (ReadingModel.temperature, ReadingModel.humidity, ReadingModel.voltage),
+            strict=True,
+        )
+        for part, agg in (
+            ("min", func.min),
+            ("max", func.max),
+            ("sum", func.sum),
+            ("count", func.count),
+        )
+    ),
+).where(
+    ReadingModel.device_uuid == _DEVICE_PK,
+    or_(
+        and_(
+            ReadingModel.timestamp >= bindparam("start"),
+            ReadingModel.timestamp < bindparam("minute_start"),
+        ),
+        and_(
+            ReadingModel.timestamp >= bindparam("minute_end"),
+            ReadingModel.timestamp <= bindparam("end"),
+        ),
+    ),
+)
+
+_PARTIALS = union_all(
+    _RAW_PARTIALS,
+    _rollup_partials(_READINGS_1M, ("minute_start", "hour_start"), ("hour_end", "minute_end")),
+    _rollup_partials(_READINGS_1H, ("hour_start", "hour_end")),
+).subquery("partials")
+
+_ROLLUP_STATS_STMT = select(
+    cast(func.coalesce(func.sum(_PARTIALS.c.reading_count), 0), BigInteger).label("count"),
+    func.min(_PARTIALS.c.first_reading).label("first_reading"),
+    func.max(_PARTIALS.c.last_reading).label("last_reading"),
+    *(
+        expr
+        for metric in _METRICS
+        for expr in (
+            func.min(_PARTIALS.c[f"{metric}_min"]).label(f"{metric}_min"),
+            func.max(_PARTIALS.c[f"{metric}_max"]).label(f"{metric}_max"),
+            cast(
+                func.sum(_PARTIALS.c[f"{metric}_sum"])
+                / func.nullif(func.sum(_PARTIALS.c[f"{metric}_count"]), 0),
+                Float,
+            ).label(f"{metric}_avg"),
+        )
+    ),
+    _DEVICE_PK.label("device_uuid"),
+)
+
+
+def _round2(value: float | None) -> float | None:
+    """Round an aggregate to two decimals, keeping NULL as None."""
+    return None if value is None else round(value, 2)
+
+
+def _floor_to(value: datetime, step: timedelta) -> datetime:
+    """Round a timestamp down to a whole minute or hour."""
+    if step >= timedelta(hours=1):
+        return value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(second=0, microsecond=0)
+
+
+def _ceil_to(value: datetime, step: timedelta) -> datetime:
+    """Round a timestamp up to a whole minute or hour."""
+    floored = _floor_to(value, step)
+    return floored if floored == value else floored + step
+
 
 class ReadingRepository:
     """
@@ -39,36 +335,130 @@ class ReadingRepository:
         """
         self._session = session
 
-    async def create(self, reading: Reading) -> Reading:
+    async def create(
+        self,
+        reading_id: UUID,
+        device_id: str,
+        device_uuid: UUID,
+        metrics: SensorMetrics,
+    ) -> Reading:
         """
         Persist a new reading.
 
         Readings are immutable - once created, they are never updated.
+        The timestamp is assigned by the database at insert time.
 
         Args:
-            reading: Reading entity to persist.
+            reading_id: Identifier of the new reading.
+            device_id: Human-readable device identifier.
+            device_uuid: Primary key of the device that produced the reading.
+            metrics: Sensor metric values.
 
         Returns:
-            Created Reading entity.
-        """
-        model = ReadingModel(
-            id=reading.id,
-            device_id=reading.device_id,
-            timestamp=reading.timestamp,
-            temperature=reading.metrics.temperature,
-            humidity=reading.metrics.humidity,
-            voltage=reading.metrics.voltage,
+            Created Reading entity with its stored timestamp.
+        """
+        result = await self._session.execute(
+            _INSERT_STMT, [self.to_row(reading_id, device_uuid, metrics)]
         )
-
-        self._session.add(model)
-        await self._session.flush()
+        timestamp = result.scalar_one()
 
         logger.debug(
             "Reading created",
-            reading_id=str(reading.id),
-            device_id=reading.device_id,
+            reading_id=str(reading_id),
+            device_id=device_id,
         )
-        return reading
+        return Reading(id=reading_id, device_id=device_id, metrics=metrics, timestamp=timestamp)
+
+    async def bulk_insert(self, rows: list[dict[str, Any]]) -> list[datetime]:
+        """
+        Persist many readings in a single multi-row INSERT.
+
+        Bypasses the ORM unit of work; rows are plain column dicts as
+        produced by ``to_row``.
+
+        Args:
+            rows: Column values for each reading.
+
+        Returns:
+            Database-assigned timestamp of each row, in input order.
+        """
+        if not rows:
+            return []
+
+        result = await self._session.execute(_INSERT_STMT, rows)
+        timestamps = list(result.scalars())
+
+        logger.debug("Readings bulk inserted", count=len(rows))
+        return timestamps
+
+    async def copy_insert(self, rows: list[dict[str, Any]]) -> None:
+        """
+        Persist many readings without reading back their timestamps.
+
+        On asyncpg the rows are streamed with ``COPY ... FROM STDIN``,
+        which skips per-row parameter binding and RETURNING; the timestamp
+        column default still applies. Other drivers fall back to the
+        multi-row INSERT.
+
+        COPY goes to the raw asyncpg connection, and SQLAlchemy only sends
+        BEGIN with the session's first statement, so on asyncpg the session
+        must already have executed a statement in this transaction.
+        Otherwise the rows would be committed on their own.
+
+        Args:
+            rows: Column values for each reading, as built by ``to_row``.
+
+        Raises:
+            RuntimeError: If no transaction is open on the asyncpg connection.
+        """
+        if not rows:
+            return
+
+        if self._session.get_bind().dialect.driver != "asyncpg":
+            await self._session.execute(_INSERT_STMT, rows)
+        else:
+            connection = await self._session.connection()
+            raw = await connection.get_raw_connection()
+            driver = raw.driver_connection
+            if driver is None:
+                raise RuntimeError("Database connection is closed")
+            if not driver.is_in_transaction():
+                raise RuntimeError("copy_insert must run inside an open transaction")
+            await driver.copy_records_to_table(
+                ReadingModel.__tablename__,
+                records=[tuple(row[column] for column in _COPY_COLUMNS) for row in rows],
+                columns=_COPY_COLUMNS,
+            )
+
+        logger.debug("Readings copied", count=len(rows))
+
+    @staticmethod
+    def to_row(
+        reading_id: UUID,
+        device_uuid: UUID,
+        metrics: SensorMetrics,
+    ) -> dict[str, Any]:
+        """
+        Build the column dict for inserting a reading.
+
+        The timestamp is omitted so the column default assigns it.
+
+        Args:
+            reading_id: Identifier of the new reading.
+            device_uuid: Primary key of the device that produced the reading.
+            metrics: Sensor metric values.
+
+        Returns:
+            Mapping of readings column names to values.
+        """
+        row: dict[str, Any] = {
+            "id": reading_id,
+            "device_uuid": device_uuid,
+            "temperature": metrics.temperature,
+            "humidity": metrics.humidity,
+            "voltage": metrics.voltage,
+        }
+        return row
 
     async def get_latest(self, device_id: str) -> Reading | None:
         """
@@ -80,27 +470,59 @@ class ReadingRepository:
         Returns:
             Latest Reading entity if exists, None otherwise.
         """
-        stmt = (
-            select(ReadingModel)
-            .where(ReadingModel.device_id == device_id)
-            .order_by(ReadingModel.timestamp.desc())
-            .limit(1)
-        )
-
-        result = await self._session.execute(stmt)
-        model = result.scalar_one_or_none()
+        result = await self._session.execute(_LATEST_STMT, {"device_id": device_id})
+        row = result.one_or_none()
 
-        if model is None:
+        if row is None:
             return None
 
-        return self._to_entity(model)
+        return self._to_entity(row, device_id)
+
+    async def get_latest_if_registered(self, device_id: str) -> tuple[bool, Reading | None]:
+        """
+        Get the most recent reading for a device, checking it exists.
+
+        The device lookup and the reading lookup share one query.
+
+        Args:
+            device_id: Human-readable device identifier.
+
+        Returns:
+            Whether the device exists, and its latest Reading or None.
+        """
+        result = await self._session.execute(_LATEST_WITH_DEVICE_STMT, {"device_id": device_id})
+        row = result.one_or_none()
+
+        if row is None:
+            return False, None
+        if row.id is None:
+            return True, None
+
+        return True, self._to_entity(row, device_id)
+
+    async def get_latest_per_device(self, include_inactive: bool = False) -> dict[str, Reading]:
+        """
+        Get the most recent reading of every device in one query.
+
+        Args:
+            include_inactive: If True, includes deactivated devices.
+
+        Returns:
+            Latest Reading per device_id; devices without readings are absent.
+        """
+        stmt = _LATEST_PER_DEVICE_STMT
+        if not include_inactive:
+            stmt = stmt.where(DeviceModel.is_active.is_(True))
+
+        result = await self._session.execute(stmt)
+        return {row.device_id: self._to_entity(row, row.device_id) for row in result}
 
     async def get_history(
         self,
         device_id: str,
         time_range: TimeRange,
         limit: int = 1000,
-    ) -> list[Reading]:
+    ) -> list[Reading] | None:
         """
         Get readings for a device within a time range.
 
@@ -110,29 +532,92 @@ class ReadingRepository:
             limit: Maximum number of readings to return.
 
         Returns:
-            List of Reading entities, ordered by timestamp ascending.
-        """
-        stmt = (
-            select(ReadingModel)
-            .where(
-                ReadingModel.device_id == device_id,
-                ReadingModel.timestamp >= time_range.start,
-                ReadingModel.timestamp <= time_range.end,
-            )
-            .order_by(ReadingModel.timestamp.asc())
-            .limit(limit)
+            List of Reading entities, ordered by timestamp ascending,
+            or None if the device does not exist.
+        """
+        result = await self._session.execute(
+            _HISTORY_STMT,
+            {
+                "device_id": device_id,
+                "start": time_range.start,
+                "end": time_range.end,
+                "limit": limit,
+            },
         )
+        rows = result.all()
 
-        result = await self._session.execute(stmt)
-        models = result.scalars().all()
+        if not rows:
+            return None
+
+        # A device without readings in range yields one all-NULL reading
+        return [self._to_entity(row, device_id) for row in rows if row.id is not None]
+
+    async def stream_history(
+        self,
+        device_id: str,
+        time_range: TimeRange,
+        limit: int = 1000,
+        batch_size: int = 500,
+    ) -> AsyncIterator[list[dict[str, Any]]] | None:
+        """
+        Stream readings for a device within a time range in batches.
+
+        Rows are fetched through a server-side cursor, so at most one
+        batch is held in memory at a time. The first batch is read before
+        returning, which is when an unknown device is detected. Only plain
+        columns are selected and each row is formatted straight into the
+        ``Reading.to_dict`` shape, without ORM instances or entities.
+
+        Args:
+            device_id: Human-readable device identifier.
+            time_range: Time range for the query.
+            limit: Maximum number of readings to return.
+            batch_size: Number of readings fetched per round trip.
+
+        Returns:
+            Async iterator of reading dictionary batches, ordered by
+            timestamp ascending, or None if the device does not exist.
+        """
+        stmt: Executable
+        if self._session.get_bind().dialect.name == "postgresql":
+            stmt = _HISTORY_ISO_ROWS_STMT
+        else:
+            stmt = _HISTORY_ROWS_STMT
+
+        result = await self._session.stream(
+            stmt.execution_options(yield_per=batch_size),
+            {
+                "device_id": device_id,
+                "start": time_range.start,
+                "end": time_range.end,
+                "limit": limit,
+            },
+        )
+        partitions = result.partitions()
+        first = await anext(partitions, None)
+
+        if first is None:
+            await result.close()
+            return None
+
+        def to_dicts(rows: Sequence[Any]) -> list[dict[str, Any]]:
+            return [self._row_to_dict(row, device_id) for row in rows if row.id is not None]
+
+        async def batches() -> AsyncIterator[list[dict[str, Any]]]:
+            try:
+                yield to_dicts(first)
+                async for rows in partitions:
+                    yield to_dicts(rows)
+            finally:
+                await result.close()
 
-        return [self._to_entity(model) for model in models]
+        return batches()
 
     async def get_stats(
         self,
         device_id: str,
         time_range: TimeRange,
-    ) -> dict[str, Any]:
+    ) -> dict[str, Any] | None:
         """
         Compute aggregated statistics for a device within a time range.
 
@@ -143,86 +628,150 @@ class ReadingRepository:
             time_range: Time range for the aggregation.
 
         Returns:
-            Dictionary with aggregated statistics.
-        """
-        stmt = select(
-            func.count(ReadingModel.id).label("count"),
-            func.min(ReadingModel.timestamp).label("first_reading"),
-            func.max(ReadingModel.timestamp).label("last_reading"),
-            # Temperature stats
-            func.min(ReadingModel.temperature).label("temp_min"),
-            func.max(ReadingModel.temperature).label("temp_max"),
-            func.avg(ReadingModel.temperature).label("temp_avg"),
-            # Humidity stats
-            func.min(ReadingModel.humidity).label("humidity_min"),
-            func.max(ReadingModel.humidity).label("humidity_max"),
-            func.avg(ReadingModel.humidity).label("humidity_avg"),
-            # Voltage stats
-            func.min(ReadingModel.voltage).label("voltage_min"),
-            func.max(ReadingModel.voltage).label("voltage_max"),
-            func.avg(ReadingModel.voltage).label("voltage_avg"),
-        ).where(
-            ReadingModel.device_id == device_id,
-            ReadingModel.timestamp >= time_range.start,
-            ReadingModel.timestamp <= time_range.end,
+            Dictionary with aggregated statistics, or None if the device
+            does not exist.
+        """
+        result = await self._session.execute(
+            _STATS_STMT,
+            {"device_id": device_id, "start": time_range.start, "end": time_range.end},
         )
+        return self._stats_to_dict(device_id, time_range, result.one())
 
-        result = await self._session.execute(stmt)
-        row = result.one()
+    async def get_stats_from_rollups(
+        self,
+        device_id: str,
+        time_range: TimeRange,
+    ) -> dict[str, Any] | None:
+        """
+        Compute aggregated statistics from the TimescaleDB rollups.
+
+        Whole hours are read from ``readings_1h``, whole minutes at the
+        edges from ``readings_1m``, and only the partial minutes at either
+        end from raw readings, all in one query. Averages are recombined
+        from sums and counts, so results match ``get_stats``.
+
+        Args:
+            device_id: Human-readable device identifier.
+            time_range: Time range for the aggregation.
+
+        Returns:
+            Dictionary with aggregated statistics, or None if the device
+            does not exist.
+        """
+        minute, hour = timedelta(minutes=1), timedelta(hours=1)
+
+        minute_start = _ceil_to(time_range.start, minute)
+        minute_end = _floor_to(time_range.end, minute)
+        if minute_start >= minute_end:
+            # No whole minute: everything comes from raw readings
+            minute_start = minute_end = time_range.end
+
+        hour_start = _ceil_to(minute_start, hour)
+        hour_end = _floor_to(minute_end, hour)
+        if hour_start >= hour_end:
+            hour_start = hour_end = minute_end
+
+        result = await self._session.execute(
+            _ROLLUP_STATS_STMT,
+            {
+                "device_id": device_id,
+                "start": time_range.start,
+                "end": time_range.end,
+                "minute_start": minute_start,
+                "minute_end": minute_end,
+                "hour_start": hour_start,
+                "hour_end": hour_end,
+            },
+        )
+        return self._stats_to_dict(device_id, time_range, result.one())
+
+    async def count_by_device(self, device_id: str) -> int:
+        """
+        Count total readings for a device.
+
+        Args:
+            device_id: Human-readable device identifier.
+
+        Returns:
+            Total number of readings.
+        """
+        result = await self._session.execute(_COUNT_STMT, {"device_id": device_id})
+        return result.scalar() or 0
+
+    @staticmethod
+    def _stats_to_dict(
+        device_id: str, time_range: TimeRange, row: Row[Any]
+    ) -> dict[str, Any] | None:
+        """Format an aggregate row as the stats response dictionary."""
+        if row.device_uuid is None:
+            return None
 
         return {
             "device_id": device_id,
             "time_range": {
-                "start": time_range.start.isoformat() + "Z",
-                "end": time_range.end.isoformat() + "Z",
+                "start": iso_utc(time_range.start),
+                "end": iso_utc(time_range.end),
             },
             "reading_count": row.count,
-            "first_reading": row.first_reading.isoformat() + "Z" if row.first_reading else None,
-            "last_reading": row.last_reading.isoformat() + "Z" if row.last_reading else None,
+            "first_reading": iso_utc(row.first_reading) if row.first_reading else None,
+            "last_reading": iso_utc(row.last_reading) if row.last_reading else None,
             "temperature": {
-                "min": round(row.temp_min, 2) if row.temp_min is not None else None,
-                "max": round(row.temp_max, 2) if row.temp_max is not None else None,
-                "avg": round(row.temp_avg, 2) if row.temp_avg is not None else None,
+                "min": _round2(row.temp_min),
+                "max": _round2(row.temp_max),
+                "avg": _round2(row.temp_avg),
                 "unit": "°C",
             },
             "humidity": {
-                "min": round(row.humidity_min, 2) if row.humidity_min is not None else None,
-                "max": round(row.humidity_max, 2) if row.humidity_max is not None else None,
-                "avg": round(row.humidity_avg, 2) if row.humidity_avg is not None else None,
+                "min": _round2(row.humidity_min),
+                "max": _round2(row.humidity_max),
+                "avg": _round2(row.humidity_avg),
                 "unit": "%",
             },
             "voltage": {
-                "min": round(row.voltage_min, 2) if row.voltage_min is not None else None,
-                "max": round(row.voltage_max, 2) if row.voltage_max is not None else None,
-                "avg": round(row.voltage_avg, 2) if row.voltage_avg is not None else None,
+                "min": _round2(row.voltage_min),
+                "max": _round2(row.voltage_max),
+                "avg": _round2(row.voltage_avg),
                 "unit": "V",
             },
         }
 
-    async def count_by_device(self, device_id: str) -> int:
-        """
-        Count total readings for a device.
-
-        Args:
-            device_id: Human-readable device identifier.
+    @staticmethod
+    def _row_to_dict(row: Row[Any], device_id: str) -> dict[str, Any]:
+        """Format a history row as the reading response dictionary."""
+        metrics = {}
+        if row.temperature is not None:
+            metrics["temperature"] = row.temperature
+        if row.humidity is not None:
+            metrics["humidity"] = row.humidity
+        if row.voltage is not None:
+            metrics["voltage"] = row.voltage
+        # Already text when the database formatted it
+        timestamp = row.timestamp
+        if not isinstance(timestamp, str):
+            timestamp = iso_utc(timestamp)
+        return {
+            "id": str(row.id),
+            "device_id": device_id,
+            "metrics": metrics,
+            "timestamp": timestamp,
+        }
 
-        Returns:
-            Total number of readings.
+    @staticmethod
+    def _to_entity(row: Any, device_id: str) -> Reading:
         """
-        stmt = select(func.count(ReadingModel.id)).where(ReadingModel.device_id == device_id)
-        result = await self._session.execute(stmt)
-        return result.scalar() or 0
+        Convert a reading row to domain entity.
 
-    @staticmethod
-    def _to_entity(model: ReadingModel) -> Reading:
-        """Convert ORM model to domain entity."""
+        Rows come from several query shapes, each with _READING_COLUMNS
+        among its columns, so only those attributes are relied on.
+        """
         return Reading(
-            id=model.id,
-            device_id=model.device_id,
-            metrics=SensorMetrics(
-                temperature=model.temperature,
-                humidity=model.humidity,
-                voltage=model.voltage,
+            id=row.id,
+            device_id=device_id,
+            # Stored values were range-checked on ingest
+            metrics=SensorMetrics.unchecked(
+                temperature=row.temperature,
+                humidity=row.humidity,
+                voltage=row.voltage,
             ),
-            timestamp=model.timestamp,
+            timestamp=row.timestamp,
         )
@@ -5,14 +5,19 @@ Computes statistics and aggregations on sensor readings.
 Aggregations are computed on-demand with caching.
 """
 
-from datetime import datetime
-from typing import Any
+import hashlib
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from typing import Any, cast
 
 from app.config.logging import get_logger
 from app.config.settings import Settings
+from app.domain.clock import as_utc, iso_utc
 from app.domain.value_objects.time_range import TimeRange
 from app.repositories.device_repository import DeviceRepository
 from app.repositories.reading_repository import ReadingRepository
+from app.services.cache import TTLCache
+from app.services.device_service import DeviceNotFoundError
 
 logger = get_logger(__name__)
 
@@ -27,7 +32,8 @@ class AggregationService:
     - Historical data with time range filtering
 
     Design decisions:
-    - Aggregations are computed on-demand (not pre-computed)
+    - Aggregations are computed on-demand, optionally from TimescaleDB
+      rollups that pre-aggregate readings per minute and hour
     - Simple in-memory caching for frequently requested data
     - Raw data is never mutated
     """
@@ -37,6 +43,7 @@ class AggregationService:
         device_repository: DeviceRepository,
         reading_repository: ReadingRepository,
         settings: Settings,
+        cache: TTLCache[str, Any] | None = None,
     ) -> None:
         """
         Initialize aggregation service.
@@ -45,13 +52,18 @@ class AggregationService:
             device_repository: Repository for device data access.
             reading_repository: Repository for reading data access.
             settings: Application settings.
+            cache: Optional cache shared across service instances; a
+                private one is created when absent.
         """
         self._device_repo = device_repository
         self._reading_repo = reading_repository
         self._settings = settings
 
-        # Simple in-memory cache with expiration tracking
-        self._cache: dict[str, tuple[datetime, Any]] = {}
+        # Bounded in-memory LRU cache with expiration tracking
+        self._cache: TTLCache[str, Any] = cache or TTLCache(
+            maxsize=settings.aggregation_cache_max_entries,
+            ttl=settings.aggregation_cache_ttl,
+        )
 
     async def get_latest_reading(self, device_id: str) -> dict[str, Any] | None:
         """
@@ -62,9 +74,14 @@ class AggregationService:
 
         Returns:
             Latest reading as dictionary, or None if no readings exist.
+
+        Raises:
+            DeviceNotFoundError: If device doesn't exist.
         """
-        reading = await self._reading_repo.get_latest(device_id)
+        found, reading = await self._reading_repo.get_latest_if_registered(device_id)
 
+        if not found:
+            raise DeviceNotFoundError(device_id)
         if reading is None:
             return None
 
@@ -86,6 +103,7 @@ class AggregationService:
             Dictionary with aggregated statistics.
 
         Raises:
+            DeviceNotFoundError: If device doesn't exist.
             ValueError: If range string is invalid.
         """
         # Parse time range
@@ -98,8 +116,14 @@ class AggregationService:
             logger.debug("Cache hit for stats", device_id=device_id, range=range_str)
             return cached
 
-        # Compute stats
-        stats = await self._reading_repo.get_stats(device_id, time_range)
+        # Compute stats, from pre-aggregated rollups where available
+        if self._settings.stats_use_rollups:
+            stats = await self._reading_repo.get_stats_from_rollups(device_id, time_range)
+        else:
+            stats = await self._reading_repo.get_stats(device_id, time_range)
+
+        if stats is None:
+            raise DeviceNotFoundError(device_id)
 
         # Cache result
         self._set_cached(cache_key, stats)
@@ -139,19 +163,11 @@ class AggregationService:
             List of readings as dictionaries.
 
         Raises:
+            DeviceNotFoundError: If device doesn't exist.
             ValueError: If time range cannot be determined.
         """
         limit = limit or self._settings.history_default_limit
-
-        # Determine time range
-        if range_str:
-            time_range = TimeRange.last(range_str)
-        elif start:
-            end = end or datetime.utcnow()
-            time_range = TimeRange.between(start, end)
-        else:
-            # Default to last 24 hours
-            time_range = TimeRange.last("24h")
+        time_range = self._history_range(start, end, range_str)
 
         # Fetch readings
         readings = await self._reading_repo.get_history(
@@ -160,6 +176,9 @@ class AggregationService:
             limit=limit,
         )
 
+        if readings is None:
+            raise DeviceNotFoundError(device_id)
+
         logger.debug(
             "Fetched history for device",
             device_id=device_id,
@@ -169,53 +188,135 @@ class AggregationService:
 
         return [r.to_dict() for r in readings]
 
-    async def get_all_devices_summary(self) -> list[dict[str, Any]]:
+    async def stream_history(
+        self,
+        device_id: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        range_str: str | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Stream historical readings for a device in batches.
+
+        Takes the same arguments as ``get_history``; readings are read
+        through a server-side cursor instead of being loaded at once.
+
+        Args:
+            device_id: Human-readable device identifier.
+            start: Start timestamp (optional if range_str provided).
+            end: End timestamp (optional, defaults to now).
+            range_str: Relative time range (e.g., "24h").
+            limit: Maximum number of readings to return.
+
+        Returns:
+            Async iterator of reading dictionary batches.
+
+        Raises:
+            DeviceNotFoundError: If device doesn't exist.
+            ValueError: If time range cannot be determined.
+        """
+        limit = limit or self._settings.history_default_limit
+        time_range = self._history_range(start, end, range_str)
+
+        batches = await self._reading_repo.stream_history(
+            device_id=device_id,
+            time_range=time_range,
+            limit=limit,
+        )
+
+        if batches is None:
+            raise DeviceNotFoundError(device_id)
+
+        logger.debug("Streaming history for device", device_id=device_id, limit=limit)
+
+        return batches
+
+    async def get_all_devices_summary(self, etag: str | None = None) -> list[dict[str, Any]]:
         """
         Get summary information for all active devices.
 
+        Args:
+            etag: The list's current entity tag from get_devices_etag. When
+                given, summaries are cached under it; any change to the
+                list moves the tag, so a cached copy is never stale.
+
         Returns:
             List of device summaries with latest reading info.
         """
+        cache_key = f"devices:{etag}" if etag else None
+        if cache_key is not None:
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                logger.debug("Cache hit for device summaries")
+                return cast(list[dict[str, Any]], cached)
+
         devices = await self._device_repo.get_all(include_inactive=False)
+        latest_by_device = await self._reading_repo.get_latest_per_device()
         summaries = []
 
         for device in devices:
-            latest = await self._reading_repo.get_latest(device.device_id)
-            reading_count = await self._reading_repo.count_by_device(device.device_id)
+            latest = latest_by_device.get(device.device_id)
 
             summary = {
                 "id": str(device.id),
                 "device_id": device.device_id,
                 "name": device.name,
                 "is_active": device.is_active,
-                "created_at": device.created_at.isoformat() + "Z",
-                "last_seen_at": device.last_seen_at.isoformat() + "Z"
-                if device.last_seen_at
-                else None,
-                "reading_count": reading_count,
+                "created_at": iso_utc(device.created_at),
+                "last_seen_at": iso_utc(device.last_seen_at) if device.last_seen_at else None,
+                "reading_count": device.reading_count,
                 "latest_reading": latest.to_dict() if latest else None,
             }
             summaries.append(summary)
 
+        if cache_key is not None:
+            self._set_cached(cache_key, summaries)
+
         return summaries
 
-    def _get_cached(self, key: str) -> Any | None:
-        """Get cached value if not expired."""
-        if key not in self._cache:
-            return None
+    async def get_devices_etag(self) -> str:
+        """
+        Get an entity tag for the device summary list.
 
-        cached_at, value = self._cache[key]
-        age_seconds = (datetime.utcnow() - cached_at).total_seconds()
+        Computed from a single aggregate over devices, so a client with an
+        up-to-date copy can be answered without building the summaries.
 
-        if age_seconds > self._settings.aggregation_cache_ttl:
-            del self._cache[key]
-            return None
+        Returns:
+            Quoted strong entity tag.
+        """
+        version = await self._device_repo.get_list_version(include_inactive=False)
+        digest = hashlib.blake2b(repr(version).encode(), digest_size=8).hexdigest()
+        return f'"{digest}"'
+
+    @staticmethod
+    def _history_range(
+        start: datetime | None,
+        end: datetime | None,
+        range_str: str | None,
+    ) -> TimeRange:
+        """
+        Determine the time range of a history query.
+
+        Explicit bounds may be naive (taken as UTC) or aware; both are
+        normalized so they compare against the aware default end.
+        """
+        now = datetime.now(UTC)
+        if range_str:
+            return TimeRange.last(range_str, now)
+        if start:
+            return TimeRange.between(as_utc(start), as_utc(end) if end else now)
 
-        return value
+        # Default to last 24 hours
+        return TimeRange.last("24h", now)
+
+    def _get_cached(self, key: str) -> Any | None:
+        """Get cached value if not expired."""
+        return self._cache.get(key)
 
     def _set_cached(self, key: str, value: Any) -> None:
         """Set cached value with timestamp."""
-        self._cache[key] = (datetime.utcnow(), value)
+        self._cache.set(key, value)
 
     def clear_cache(self, device_id: str | None = None) -> None:
         """
@@ -225,8 +326,8 @@ class AggregationService:
             device_id: If provided, only clear cache for this device.
         """
         if device_id:
-            keys_to_remove = [k for k in self._cache if device_id in k]
-            for key in keys_to_remove:
-                del self._cache[key]
+            for key in self._cache:
+                if device_id in key:
+                    self._cache.pop(key)
         else:
             self._cache.clear()
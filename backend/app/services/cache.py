@@ -0,0 +1,74 @@
+"""
+In-process caches.
+
+Bounded LRU caches whose entries expire after a fixed time-to-live.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from typing import Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded, time-limited LRU cache.
+
+    Expiry is checked against the monotonic clock on lookup, so entries
+    cost one float comparison to validate and wall-clock jumps do not
+    affect them. Inserting past ``maxsize`` evicts the least recently
+    used entry.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept.
+            ttl: Seconds an entry stays valid. Zero disables caching.
+        """
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(list(self._entries))
+
+    def get(self, key: K) -> V | None:
+        """Get a cached value, or None if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Cache a value."""
+        if self._ttl <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        """Drop a cached value."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every cached value."""
+        self._entries.clear()
@@ -0,0 +1,45 @@
+"""
+Device cache.
+
+Keeps the primary key and active flag of recently seen devices in
+process memory so repeat ingests skip the device lookup.
+"""
+
+from typing import NamedTuple
+from uuid import UUID
+
+from app.services.cache import TTLCache
+
+
+class CachedDevice(NamedTuple):
+    """The device fields ingestion needs."""
+
+    id: UUID
+    is_active: bool
+
+
+class DeviceCache(TTLCache[str, CachedDevice]):
+    """
+    Bounded, time-limited LRU cache of devices by device_id.
+
+    Only registered devices are cached, so a newly registered device is
+    accepted immediately. Deactivation invalidates the entry in this
+    process, and on PostgreSQL in the other worker processes too, through
+    a NOTIFY on DEVICE_DEACTIVATED_CHANNEL. Notifications are best-effort,
+    so the TTL remains the bound on how long a missed one can go unseen.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 60.0) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of devices kept; least recently used
+                entries are evicted first.
+            ttl: Seconds an entry stays valid. Zero disables caching.
+        """
+        super().__init__(maxsize=maxsize, ttl=ttl)
+
+    def invalidate(self, device_id: str) -> None:
+        """Drop a cached device."""
+        self.pop(device_id)
@@ -4,45 +4,60 @@ Device service.
 Handles device management operations.
 """
 
+import base64
 import hashlib
 import secrets
 from datetime import UTC, datetime
-from typing import Any
+from typing import Any, ClassVar
 
 from app.config.logging import get_logger
+from app.domain.clock import iso_utc
 from app.domain.entities.device import Device
 from app.repositories.device_repository import DeviceRepository
+from app.services.device_cache import DeviceCache
 
 logger = get_logger(__name__)
 
+# Random bytes per device API key
+_API_KEY_BYTES = 32
+
 
 class DeviceError(Exception):
-    """Base exception for device errors."""
+    """
+    Base exception for device errors.
+
+    Subclasses set code and a message template; the message is only
+    formatted when it is read.
+    """
+
+    code: ClassVar[str]
+    template: ClassVar[str]
+
+    def __init__(self, device_id: str) -> None:
+        self.device_id = device_id
+        super().__init__(device_id)
 
-    def __init__(self, message: str, code: str) -> None:
-        self.message = message
-        self.code = code
-        super().__init__(message)
+    @property
+    def message(self) -> str:
+        """Human-readable error message."""
+        return self.template.format(device_id=self.device_id)
+
+    def __str__(self) -> str:
+        return self.message
 
 
 class DeviceExistsError(DeviceError):
     """Device already exists."""
 
-    def __init__(self, device_id: str) -> None:
-        super().__init__(
-            message=f"Device already exists: {device_id}",
-            code="DEVICE_EXISTS",
-        )
+    code = "DEVICE_EXISTS"
+    template = "Device already exists: {device_id}"
 
 
 class DeviceNotFoundError(DeviceError):
     """Device not found."""
 
-    def __init__(self, device_id: str) -> None:
-        super().__init__(
-            message=f"Device not found: {device_id}",
-            code="DEVICE_NOT_FOUND",
-        )
+    code = "DEVICE_NOT_FOUND"
+    template = "Device not found: {device_id}"
 
 
 class DeviceService:
@@ -56,14 +71,21 @@ class DeviceService:
     - Generate API keys
     """
 
-    def __init__(self, device_repository: DeviceRepository) -> None:
+    def __init__(
+        self,
+        device_repository: DeviceRepository,
+        device_cache: DeviceCache | None = None,
+    ) -> None:
         """
         Initialize device service.
 
         Args:
             device_repository: Repository for device data access.
+            device_cache: Optional ingest device cache to invalidate when
+                a device is deactivated.
         """
         self._device_repo = device_repository
+        self._device_cache = device_cache
 
     async def register_device(
         self,
@@ -87,10 +109,6 @@ class DeviceService:
             DeviceExistsError: If device_id already exists.
             ValueError: If device_id is invalid.
         """
-        # Check if device already exists
-        if await self._device_repo.exists(device_id):
-            raise DeviceExistsError(device_id)
-
         # Generate API key
         raw_api_key = self._generate_api_key()
         api_key_hash = self._hash_api_key(raw_api_key)
@@ -103,19 +121,60 @@ class DeviceService:
             created_at=datetime.now(UTC),
         )
 
-        # Persist device
-        await self._device_repo.create(device)
+        # Persist device; a taken device_id inserts nothing
+        if await self._device_repo.create_if_absent(device) is None:
+            raise DeviceExistsError(device_id)
 
         logger.info("Device registered", device_id=device_id)
 
-        return {
-            "id": str(device.id),
-            "device_id": device.device_id,
-            "name": device.name,
-            "api_key": raw_api_key,  # Only returned on creation!
-            "created_at": device.created_at.isoformat() + "Z",
-            "message": "Store the API key securely - it will not be shown again.",
-        }
+        return self._registration_result(device, raw_api_key)
+
+    async def register_devices(
+        self,
+        devices: list[tuple[str, str | None]],
+    ) -> list[dict[str, Any]]:
+        """
+        Register several devices at once.
+
+        Checks existence with one query and inserts every device with one
+        statement, so onboarding a fleet costs two round trips instead of
+        two per device. Either all devices are registered or none.
+
+        Args:
+            devices: (device_id, name) pairs to register.
+
+        Returns:
+            Device info and raw API key per device, in request order.
+
+        Raises:
+            DeviceExistsError: If any device_id already exists.
+            ValueError: If a device_id is invalid or repeated in the batch.
+        """
+        device_ids = [device_id for device_id, _ in devices]
+        if len(set(device_ids)) != len(device_ids):
+            raise ValueError("Each device_id may appear only once per batch")
+
+        existing = await self._device_repo.existing_ids(device_ids)
+        if existing:
+            raise DeviceExistsError(next(d for d in device_ids if d in existing))
+
+        created_at = datetime.now(UTC)
+        registered = []
+        api_keys = self._generate_api_keys(len(devices))
+        for (device_id, name), raw_api_key in zip(devices, api_keys, strict=True):
+            device = Device.create(
+                device_id=device_id,
+                api_key_hash=self._hash_api_key(raw_api_key),
+                name=name,
+                created_at=created_at,
+            )
+            registered.append((device, raw_api_key))
+
+        await self._device_repo.create_many([device for device, _ in registered])
+
+        logger.info("Devices registered", count=len(registered))
+
+        return [self._registration_result(device, key) for device, key in registered]
 
     async def get_device(self, device_id: str) -> dict[str, Any]:
         """
@@ -140,8 +199,8 @@ class DeviceService:
             "device_id": device.device_id,
             "name": device.name,
             "is_active": device.is_active,
-            "created_at": device.created_at.isoformat() + "Z",
-            "last_seen_at": device.last_seen_at.isoformat() + "Z" if device.last_seen_at else None,
+            "created_at": iso_utc(device.created_at),
+            "last_seen_at": iso_utc(device.last_seen_at) if device.last_seen_at else None,
         }
 
     async def list_devices(self, include_inactive: bool = False) -> list[dict[str, Any]]:
@@ -162,10 +221,8 @@ class DeviceService:
                 "device_id": device.device_id,
                 "name": device.name,
                 "is_active": device.is_active,
-                "created_at": device.created_at.isoformat() + "Z",
-                "last_seen_at": device.last_seen_at.isoformat() + "Z"
-                if device.last_seen_at
-                else None,
+                "created_at": iso_utc(device.created_at),
+                "last_seen_at": iso_utc(device.last_seen_at) if device.last_seen_at else None,
             }
             for device in devices
         ]
@@ -190,6 +247,9 @@ class DeviceService:
         if not success:
             raise DeviceNotFoundError(device_id)
 
+        if self._device_cache is not None:
+            self._device_cache.invalidate(device_id)
+
         logger.info("Device deactivated", device_id=device_id)
 
         return {
@@ -198,10 +258,36 @@ class DeviceService:
             "message": "Device deactivated successfully.",
         }
 
+    @staticmethod
+    def _registration_result(device: Device, raw_api_key: str) -> dict[str, Any]:
+        """Format a newly registered device with its one-time API key."""
+        return {
+            "id": str(device.id),
+            "device_id": device.device_id,
+            "name": device.name,
+            "api_key": raw_api_key,  # Only returned on creation!
+            "created_at": iso_utc(device.created_at),
+            "message": "Store the API key securely - it will not be shown again.",
+        }
+
     @staticmethod
     def _generate_api_key() -> str:
         """Generate a cryptographically secure API key."""
-        return secrets.token_urlsafe(32)
+        return secrets.token_urlsafe(_API_KEY_BYTES)
+
+    @staticmethod
+    def _generate_api_keys(count: int) -> list[str]:
+        """
+        Generate several API keys from one draw of random bytes.
+
+        Keys have the same form as _generate_api_key; fetching the
+        randomness once saves a system call per key for large batches.
+        """
+        entropy = secrets.token_bytes(_API_KEY_BYTES * count)
+        return [
+            base64.urlsafe_b64encode(entropy[i : i + _API_KEY_BYTES]).rstrip(b"=").decode("ascii")
+            for i in range(0, len(entropy), _API_KEY_BYTES)
+        ]
 
     @staticmethod
     def _hash_api_key(api_key: str) -> str:
@@ -5,15 +5,23 @@ Handles sensor data ingestion with validation, authentication,
 server-side timestamping, and persistence.
 """
 
+import asyncio
+from collections.abc import Callable, Iterable
+from contextlib import AbstractAsyncContextManager
 from datetime import UTC, datetime
 from typing import Any
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.logging import get_logger
 from app.config.settings import Settings
 from app.domain.entities.reading import Reading
+from app.domain.ids import uuid7
 from app.domain.value_objects.metrics import SensorMetrics
 from app.repositories.device_repository import DeviceRepository
 from app.repositories.reading_repository import ReadingRepository
+from app.services.device_cache import CachedDevice, DeviceCache
 
 logger = get_logger(__name__)
 
@@ -64,6 +72,245 @@ class AuthenticationError(IngestionError):
         )
 
 
+# Queue marker telling the writer task to flush and exit
+_STOP = object()
+
+# Row to insert, with the future of a caller waiting on it (if any)
+_QueuedRow = tuple[dict[str, Any], asyncio.Future[datetime] | None]
+
+
+def _tally_seen(readings: Iterable[tuple[UUID, datetime]]) -> list[tuple[UUID, datetime, int]]:
+    """Newest timestamp and reading count per device primary key."""
+    seen: dict[UUID, tuple[datetime, int]] = {}
+    for device_pk, timestamp in readings:
+        newest, count = seen.get(device_pk, (timestamp, 0))
+        seen[device_pk] = (max(newest, timestamp), count + 1)
+    return [(device_pk, newest, count) for device_pk, (newest, count) in seen.items()]
+
+
+class ReadingBatchWriter:
+    """
+    Background writer that batches reading inserts.
+
+    Readings submitted by concurrent ingest requests are queued and written
+    by a single task in multi-row INSERTs of up to ``max_batch_size`` rows,
+    or whatever has accumulated after ``max_batch_delay`` seconds. The
+    devices' last_seen_at and reading counts are updated in the same
+    transaction, once per device. This amortizes round trips and commits
+    across many readings.
+
+    A failed batch fails only its own waiters. If the task exits for any
+    reason, every reading still queued is failed rather than left pending.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AbstractAsyncContextManager[AsyncSession]],
+        max_batch_size: int = 500,
+        max_batch_delay: float = 0.05,
+    ) -> None:
+        """
+        Initialize batch writer.
+
+        Args:
+            session_factory: Returns a committing session context per batch.
+            max_batch_size: Maximum readings per INSERT.
+            max_batch_delay: Maximum seconds to wait for a batch to fill.
+        """
+        self._session_factory = session_factory
+        self._max_batch_size = max_batch_size
+        self._max_batch_delay = max_batch_delay
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=max_batch_size * 10)
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the writer task is accepting readings."""
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the background writer task."""
+        if self.is_running:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            "Reading batch writer started",
+            max_batch_size=self._max_batch_size,
+            max_batch_delay=self._max_batch_delay,
+        )
+
+    async def stop(self) -> None:
+        """
+        Flush queued readings and stop the writer task.
+
+        Safe to call if the task has already exited; never raises for a
+        crashed task, so shutdown can continue.
+        """
+        task, self._task = self._task, None
+        if task is None:
+            return
+
+        if task.done():
+            # Already exited; report how instead of re-raising into shutdown
+            if task.cancelled():
+                logger.warning("Reading batch writer was cancelled")
+            elif task.exception() is not None:
+                logger.error("Reading batch writer exited with an error", exc_info=task.exception())
+        else:
+            await self._queue.put(_STOP)
+            await task
+
+        logger.info("Reading batch writer stopped")
+
+    async def submit(
+        self,
+        reading_id: UUID,
+        device_uuid: UUID,
+        metrics: SensorMetrics,
+        wait: bool = True,
+    ) -> datetime | None:
+        """
+        Queue a reading for insertion.
+
+        The row carries no timestamp; the database assigns it at insert time.
+
+        Args:
+            reading_id: Identifier of the new reading.
+            device_uuid: Primary key of the device that produced the reading.
+            metrics: Sensor metric values.
+            wait: If True, return only after the batch is committed.
+
+        Returns:
+            Stored timestamp when ``wait`` is True, else None.
+
+        Raises:
+            RuntimeError: If the writer is not running.
+            Exception: Any database error from the batch, when ``wait`` is True.
+        """
+        if not self.is_running:
+            raise RuntimeError("Reading batch writer is not running")
+
+        row = ReadingRepository.to_row(reading_id, device_uuid, metrics)
+        future: asyncio.Future[datetime] | None = None
+        if wait:
+            future = asyncio.get_running_loop().create_future()
+
+        await self._queue.put((row, future))
+
+        # The task may have exited while we waited for queue space
+        if not self.is_running:
+            self._fail_pending([])
+
+        if future is None:
+            return None
+        return await future
+
+    async def _run(self) -> None:
+        """Drain the queue into batches until stopped."""
+        batch: list[_QueuedRow] = []
+        try:
+            stopping = False
+            while not stopping:
+                batch, stopping = await self._next_batch()
+                if batch:
+                    await self._flush(batch)
+                batch = []
+        except Exception:
+            logger.exception("Reading batch writer crashed")
+        finally:
+            self._fail_pending(batch)
+
+    async def _next_batch(self) -> tuple[list[_QueuedRow], bool]:
+        """
+        Collect the next batch from the queue.
+
+        Returns:
+            Tuple of queued rows and whether the stop marker was reached.
+        """
+        loop = asyncio.get_running_loop()
+
+        item = await self._queue.get()
+        if item is _STOP:
+            return [], True
+
+        batch = [item]
+        deadline = loop.time() + self._max_batch_delay
+
+        while len(batch) < self._max_batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except TimeoutError:
+                    break
+
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+
+        return batch, False
+
+    async def _flush(self, batch: list[_QueuedRow]) -> None:
+        """
+        Insert one batch and resolve its waiters.
+
+        Stored timestamps are only read back when a caller is waiting for
+        them; otherwise the batch goes through the cheaper COPY path and
+        the devices' last_seen_at is taken from the flush time.
+        """
+        rows = [row for row, _ in batch]
+        try:
+            async with self._session_factory() as session:
+                repository = ReadingRepository(session)
+                devices = DeviceRepository(session)
+                device_pks = [row["device_uuid"] for row in rows]
+                if all(future is None for _, future in batch):
+                    timestamps = [datetime.now(UTC)] * len(rows)
+                    # The UPDATE opens the session's transaction; COPY
+                    # bypasses SQLAlchemy, so issued first it would commit
+                    # on its own
+                    await devices.record_readings(
+                        _tally_seen(zip(device_pks, timestamps, strict=True))
+                    )
+                    await repository.copy_insert(rows)
+                else:
+                    timestamps = await repository.bulk_insert(rows)
+                    await devices.record_readings(
+                        _tally_seen(zip(device_pks, timestamps, strict=True))
+                    )
+            for (_, future), timestamp in zip(batch, timestamps, strict=True):
+                if future is not None and not future.done():
+                    future.set_result(timestamp)
+        except Exception as e:
+            logger.exception("Failed to write reading batch", count=len(batch))
+            for _, future in batch:
+                if future is not None and not future.done():
+                    future.set_exception(e)
+
+    def _fail_pending(self, batch: list[_QueuedRow]) -> None:
+        """Fail the given batch and everything left in the queue."""
+        pending = list(batch)
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if item is not _STOP:
+                pending.append(item)
+
+        error = RuntimeError("Reading batch writer stopped before the reading was written")
+        for _, future in pending:
+            if future is not None and not future.done():
+                future.set_exception(error)
+
+        if pending:
+            logger.error("Dropped unwritten readings", count=len(pending))
+
+
 class IngestionService:
     """
     Service for ingesting sensor readings from ESP32 devices.
@@ -82,6 +329,8 @@ class IngestionService:
         reading_repository: ReadingRepository,
         settings: Settings,
         websocket_manager: Any = None,  # Optional, injected for realtime
+        reading_writer: ReadingBatchWriter | None = None,
+        device_cache: DeviceCache | None = None,
     ) -> None:
         """
         Initialize ingestion service.
@@ -91,16 +340,22 @@ class IngestionService:
             reading_repository: Repository for reading data access.
             settings: Application settings.
             websocket_manager: Optional WebSocket manager for realtime updates.
+            reading_writer: Optional batch writer; readings are inserted
+                directly through the repository when absent or stopped.
+            device_cache: Optional device cache shared across
+                requests; devices are looked up on every ingest when absent.
         """
         self._device_repo = device_repository
         self._reading_repo = reading_repository
         self._settings = settings
         self._ws_manager = websocket_manager
+        self._reading_writer = reading_writer
+        self._device_cache = device_cache
 
     async def ingest(
         self,
         device_id: str,
-        metrics_data: dict[str, Any],
+        metrics: SensorMetrics,
         api_key: str | None,
     ) -> Reading:
         """
@@ -109,15 +364,16 @@ class IngestionService:
         Flow:
         1. Validate API key is present
         2. Validate device exists and is active
-        3. Validate metric values
-        4. Assign server-side UTC timestamp
-        5. Persist reading
-        6. Update device last_seen_at
+        3. Require at least one metric value
+        4. Persist reading
+        5. Take the database-assigned UTC timestamp
+        6. Update device last_seen_at (the batch writer does this with
+           the insert)
         7. Broadcast to WebSocket subscribers
 
         Args:
             device_id: Human-readable device identifier.
-            metrics_data: Dictionary with temperature, humidity, voltage.
+            metrics: Validated sensor metric values.
             api_key: API key for device authentication.
 
         Returns:
@@ -127,9 +383,129 @@ class IngestionService:
             AuthenticationError: If API key is invalid.
             DeviceNotFoundError: If device doesn't exist.
             DeviceInactiveError: If device is deactivated.
-            InvalidPayloadError: If metrics are invalid.
+            InvalidPayloadError: If no metric value is present.
         """
         # 1. Validate API key
+        self._authenticate(device_id, api_key)
+
+        # 2. Validate device exists
+        device = self._check_device(device_id, await self._get_cached_device(device_id))
+
+        # 3. Require at least one metric
+        if not metrics.has_any_metric:
+            raise InvalidPayloadError("At least one metric value is required")
+
+        # 4-5. Persist reading; the database assigns the UTC timestamp
+        # CRITICAL: Never trust client timestamps
+        reading_id = uuid7()
+
+        if self._reading_writer is not None and self._reading_writer.is_running:
+            timestamp = await self._reading_writer.submit(
+                reading_id,
+                device.id,
+                metrics,
+                wait=self._settings.ingest_wait_for_commit,
+            )
+            # Without waiting for the insert the stored timestamp is not yet
+            # known; report the acceptance time, which precedes it by at most
+            # one batch delay.
+            if timestamp is None:
+                timestamp = datetime.now(UTC)
+            reading = Reading(
+                id=reading_id,
+                device_id=device_id,
+                metrics=metrics,
+                timestamp=timestamp,
+            )
+        else:
+            reading = await self._reading_repo.create(reading_id, device_id, device.id, metrics)
+
+            # 6. Update device last_seen_at
+            await self._device_repo.update_last_seen(device_id, reading.timestamp)
+
+        logger.info(
+            "Reading ingested successfully",
+            device_id=device_id,
+            reading_id=str(reading.id),
+            timestamp=reading.timestamp.isoformat(),
+        )
+
+        # 7. Broadcast to WebSocket subscribers in the background
+        if self._ws_manager is not None:
+            self._ws_manager.publish_to_device(device_id, reading.to_dict())
+
+        return reading
+
+    async def ingest_batch(
+        self,
+        readings: list[tuple[str, SensorMetrics]],
+        api_key: str | None,
+    ) -> list[Reading]:
+        """
+        Ingest many sensor readings, possibly from several devices.
+
+        Same checks as ``ingest``, but the batch is accepted or rejected
+        as a whole, and its database work takes a fixed number of round
+        trips: one lookup for uncached devices, one multi-row INSERT and
+        one UPDATE of last_seen_at per device, sent as an executemany.
+
+        Args:
+            readings: Device identifier and validated metrics per reading.
+            api_key: API key for device authentication.
+
+        Returns:
+            Created Reading entities, in input order.
+
+        Raises:
+            AuthenticationError: If API key is invalid.
+            DeviceNotFoundError: If any device doesn't exist.
+            DeviceInactiveError: If any device is deactivated.
+            InvalidPayloadError: If any reading has no metric value.
+        """
+        if not readings:
+            return []
+
+        device_ids = list(dict.fromkeys(device_id for device_id, _ in readings))
+        self._authenticate(device_ids[0], api_key)
+
+        found = await self._get_cached_devices(device_ids)
+        devices = {
+            device_id: self._check_device(device_id, found.get(device_id))
+            for device_id in device_ids
+        }
+
+        if not all(metrics.has_any_metric for _, metrics in readings):
+            raise InvalidPayloadError("At least one metric value is required")
+
+        # CRITICAL: Never trust client timestamps
+        reading_ids = [uuid7() for _ in readings]
+        timestamps = await self._reading_repo.bulk_insert(
+            [
+                ReadingRepository.to_row(reading_id, devices[device_id].id, metrics)
+                for reading_id, (device_id, metrics) in zip(reading_ids, readings, strict=True)
+            ]
+        )
+        created = [
+            Reading(id=reading_id, device_id=device_id, metrics=metrics, timestamp=timestamp)
+            for reading_id, (device_id, metrics), timestamp in zip(
+                reading_ids, readings, timestamps, strict=True
+            )
+        ]
+
+        await self._device_repo.record_readings(
+            _tally_seen((devices[reading.device_id].id, reading.timestamp) for reading in created)
+        )
+
+        logger.info("Reading batch ingested", count=len(created), devices=len(devices))
+
+        if self._ws_manager is not None:
+            for reading in created:
+                self._ws_manager.publish_to_device(reading.device_id, reading.to_dict())
+
+        return created
+
+    def _authenticate(self, device_id: str, api_key: str | None) -> None:
+        """Reject a missing or unknown device API key."""
         if not api_key:
             logger.warning("Ingestion attempt without API key", device_id=device_id)
             raise AuthenticationError()
@@ -142,8 +518,9 @@ class IngestionService:
             )
             raise AuthenticationError()
 
-        # 2. Validate device exists
-        device = await self._device_repo.get_by_id(device_id)
+    @staticmethod
+    def _check_device(device_id: str, device: CachedDevice | None) -> CachedDevice:
+        """Reject an unknown or inactive device."""
         if device is None:
             logger.warning("Ingestion for unknown device", device_id=device_id)
             raise DeviceNotFoundError(device_id)
@@ -152,45 +529,38 @@ class IngestionService:
             logger.warning("Ingestion for inactive device", device_id=device_id)
             raise DeviceInactiveError(device_id)
 
-        # 3. Validate and parse metrics
-        try:
-            metrics = SensorMetrics.from_dict(metrics_data)
-        except ValueError as e:
-            logger.warning(
-                "Invalid metrics in payload",
-                device_id=device_id,
-                error=str(e),
-            )
-            raise InvalidPayloadError(str(e))
-
-        if not metrics.has_any_metric:
-            raise InvalidPayloadError("At least one metric value is required")
-
-        # 4. Assign server-side timestamp
-        # CRITICAL: Never trust client timestamps
-        server_timestamp = datetime.now(UTC)
+        return device
+
+    async def _get_cached_devices(self, device_ids: list[str]) -> dict[str, CachedDevice]:
+        """Look up several devices, querying only those not cached."""
+        found: dict[str, CachedDevice] = {}
+        missing = []
+        for device_id in device_ids:
+            cached = self._device_cache.get(device_id) if self._device_cache is not None else None
+            if cached is not None:
+                found[device_id] = cached
+            else:
+                missing.append(device_id)
+
+        for device_id, device in (await self._device_repo.get_many_by_id(missing)).items():
+            cached = CachedDevice(device.id, device.is_active)
+            if self._device_cache is not None:
+                self._device_cache.set(device_id, cached)
+            found[device_id] = cached
+        return found
+
+    async def _get_cached_device(self, device_id: str) -> CachedDevice | None:
+        """Look up a device, from the cache when possible."""
+        if self._device_cache is not None:
+            cached = self._device_cache.get(device_id)
+            if cached is not None:
+                return cached
 
-        # 5. Create and persist reading
-        reading = Reading.create(
-            device_id=device_id,
-            metrics=metrics,
-            timestamp=server_timestamp,
-        )
-
-        reading = await self._reading_repo.create(reading)
-
-        # 6. Update device last_seen_at
-        await self._device_repo.update_last_seen(device_id, server_timestamp)
-
-        logger.info(
-            "Reading ingested successfully",
-            device_id=device_id,
-            reading_id=str(reading.id),
-            timestamp=server_timestamp.isoformat(),
-        )
-
-        # 7. Broadcast to WebSocket subscribers
-        if self._ws_manager is not None:
-            await self._ws_manager.broadcast_to_device(device_id, reading.to_dict())
+        device = await self._device_repo.get_by_id(device_id)
+        if device is None:
+            return None
 
-        return reading
+        cached = CachedDevice(device.id, device.is_active)
+        if self._device_cache is not None:
+            self._device_cache.set(device_id, cached)
+        return cached
@@ -1,16 +1,6 @@
-import asyncio
-
 import pytest
 
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
-
 @pytest.fixture
 def anyio_backend():
     """Use asyncio backend for anyio."""
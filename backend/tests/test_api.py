@@ -1,21 +1,50 @@
 from datetime import UTC, datetime
-from unittest.mock import AsyncMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 from uuid import uuid4
 
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 
-from app.domain.entities.device import Device, DeviceStatus
+from app.api.dependencies import (
+    get_aggregation_service,
+    get_device_cache,
+    get_device_service,
+    get_ingestion_service,
+)
 from app.domain.entities.reading import Reading
 from app.domain.value_objects.metrics import SensorMetrics
-from app.main import app
+from app.main import app, lifespan
+from app.repositories.device_repository import DEVICE_DEACTIVATED_CHANNEL
+from app.services.device_cache import CachedDevice
+from app.services.device_service import DeviceNotFoundError
+
+
+@pytest.fixture(autouse=True)
+def services():
+    """Replace the service dependencies with mocks for each test."""
+    mocks = SimpleNamespace(
+        ingestion=AsyncMock(),
+        devices=AsyncMock(),
+        aggregation=AsyncMock(),
+    )
+    app.dependency_overrides[get_ingestion_service] = lambda: mocks.ingestion
+    app.dependency_overrides[get_device_service] = lambda: mocks.devices
+    app.dependency_overrides[get_aggregation_service] = lambda: mocks.aggregation
+    yield mocks
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="session")
+def transport():
+    """ASGI transport shared by every test's client."""
+    return ASGITransport(app=app)
 
 
 @pytest_asyncio.fixture
-async def async_client():
+async def async_client(transport):
     """Create async test client."""
-    transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
         yield client
 
@@ -23,7 +52,6 @@ async def async_client():
 class TestHealthEndpoint:
     """Tests for health check endpoint."""
 
-    @pytest.mark.asyncio
     async def test_health_check(self, async_client):
         """Test health check returns ok status."""
         response = await async_client.get("/health")
@@ -36,33 +64,26 @@ class TestHealthEndpoint:
 class TestIngestEndpoint:
     """Tests for data ingestion endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_ingest_valid_reading(self, async_client):
+    async def test_ingest_valid_reading(self, async_client, services):
         """Test ingesting valid sensor reading."""
-        with patch("app.api.ingest.routes.get_ingestion_service") as mock_service:
-            mock_svc = AsyncMock()
-            mock_svc.ingest_reading.return_value = Reading(
-                id=uuid4(),
-                device_id=uuid4(),
-                timestamp=datetime.now(UTC),
-                metrics=SensorMetrics(temperature=25.0, humidity=50.0, voltage=3.3),
-            )
-            mock_service.return_value = mock_svc
-
-            response = await async_client.post(
-                "/api/v1/ingest",
-                json={
-                    "device_id": "esp32-001",
-                    "temperature": 25.0,
-                    "humidity": 50.0,
-                    "voltage": 3.3,
-                },
-                headers={"X-API-Key": "test-api-key"},
-            )
+        services.ingestion.ingest.return_value = Reading(
+            id=uuid4(),
+            device_id="esp32-001",
+            timestamp=datetime.now(UTC),
+            metrics=SensorMetrics(temperature=25.0, humidity=50.0, voltage=3.3),
+        )
+
+        response = await async_client.post(
+            "/api/v1/ingest",
+            json={
+                "device_id": "esp32-001",
+                "metrics": {"temperature": 25.0, "humidity": 50.0, "voltage": 3.3},
+            },
+            headers={"X-API-Key": "test-api-key"},
+        )
 
-            assert response.status_code == 201
+        assert response.status_code == 201
 
-    @pytest.mark.asyncio
     async def test_ingest_missing_fields(self, async_client):
         """Test ingestion fails with missing required fields."""
         response = await async_client.post(
@@ -73,16 +94,17 @@ class TestIngestEndpoint:
 
         assert response.status_code == 422
 
-    @pytest.mark.asyncio
     async def test_ingest_invalid_temperature(self, async_client):
         """Test ingestion fails with invalid temperature."""
         response = await async_client.post(
             "/api/v1/ingest",
             json={
                 "device_id": "esp32-001",
-                "temperature": 200.0,  # Too high
-                "humidity": 50.0,
-                "voltage": 3.3,
+                "metrics": {
+                    "temperature": 200.0,  # Too high
+                    "humidity": 50.0,
+                    "voltage": 3.3,
+                },
             },
             headers={"X-API-Key": "test-api-key"},
         )
@@ -93,56 +115,86 @@ class TestIngestEndpoint:
 class TestDevicesEndpoint:
     """Tests for devices endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_list_devices(self, async_client):
+    async def test_list_devices(self, async_client, services):
         """Test listing all devices."""
-        with patch("app.api.devices.routes.get_device_service") as mock_service:
-            mock_svc = AsyncMock()
-            mock_svc.list_devices.return_value = [
-                Device(
-                    id=uuid4(),
-                    device_id="esp32-001",
-                    name="Test Device 1",
-                    api_key_hash="hash1",
-                    status=DeviceStatus.ONLINE,
-                    created_at=datetime.now(UTC),
-                    last_seen=datetime.now(UTC),
-                ),
-                Device(
-                    id=uuid4(),
-                    device_id="esp32-002",
-                    name="Test Device 2",
-                    api_key_hash="hash2",
-                    status=DeviceStatus.OFFLINE,
-                    created_at=datetime.now(UTC),
-                    last_seen=datetime.now(UTC),
-                ),
-            ]
-            mock_service.return_value = mock_svc
-
-            response = await async_client.get("/api/v1/devices")
-
-            assert response.status_code == 200
-            data = response.json()
-            assert len(data) == 2
-
-    @pytest.mark.asyncio
-    async def test_get_device_stats(self, async_client):
+        services.aggregation.get_devices_etag.return_value = '"devices-v1"'
+        services.aggregation.get_all_devices_summary.return_value = [
+            {
+                "id": str(uuid4()),
+                "device_id": device_id,
+                "name": name,
+                "is_active": True,
+                "created_at": datetime.now(UTC).isoformat(),
+                "last_seen_at": datetime.now(UTC).isoformat(),
+                "reading_count": 0,
+                "latest_reading": None,
+            }
+            for device_id, name in (("esp32-001", "Test Device 1"), ("esp32-002", "Test Device 2"))
+        ]
+
+        response = await async_client.get("/api/v1/devices")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["data"]) == 2
+
+    async def test_get_device_stats(self, async_client, services):
         """Test getting device statistics."""
         device_id = str(uuid4())
+        stat = {"min": 20.0, "max": 30.0, "avg": 25.0, "unit": "celsius"}
+        services.aggregation.get_device_stats.return_value = {
+            "device_id": device_id,
+            "time_range": {"start": "2026-10-13T00:00:00Z", "end": "2026-10-14T00:00:00Z"},
+            "reading_count": 1000,
+            "first_reading": None,
+            "last_reading": datetime.now(UTC).isoformat(),
+            "temperature": stat,
+            "humidity": stat,
+            "voltage": stat,
+        }
+
+        response = await async_client.get(f"/api/v1/devices/{device_id}/stats")
 
-        with patch("app.api.devices.routes.get_device_service") as mock_service:
-            mock_svc = AsyncMock()
-            mock_svc.get_device_stats.return_value = {
-                "device_id": "esp32-001",
-                "total_readings": 1000,
-                "avg_temperature": 25.0,
-                "avg_humidity": 50.0,
-                "avg_voltage": 3.3,
-                "last_reading": datetime.now(UTC).isoformat(),
-            }
-            mock_service.return_value = mock_svc
+        assert response.status_code == 200
+
+    async def test_unknown_device_error_body(self, async_client, services):
+        """Test that device errors carry their code and device_id."""
+        services.devices.get_device.side_effect = DeviceNotFoundError("esp32-404")
+
+        response = await async_client.get("/api/v1/devices/esp32-404")
+
+        assert response.status_code == 404
+        data = response.json()
+        assert data["code"] == "DEVICE_NOT_FOUND"
+        assert data["device_id"] == "esp32-404"
+        assert data["error"] == "Device not found: esp32-404"
+
+
+class TestLifespan:
+    """Tests for application startup and shutdown."""
+
+    async def test_deactivation_notifications_invalidate_device_cache(self, monkeypatch):
+        """Test that the registered listener drops the device from the cache."""
+        listeners = {}
+
+        async def listen(channel, callback):
+            listeners[channel] = callback
+            return True
+
+        async def noop(*args):
+            pass
+
+        monkeypatch.setattr("app.main.init_database", noop)
+        monkeypatch.setattr("app.main.close_database", noop)
+        monkeypatch.setattr("app.main.listen", listen)
+        monkeypatch.setattr(
+            "app.main.get_reading_writer", lambda: SimpleNamespace(start=noop, stop=noop)
+        )
+        cache = await get_device_cache()
+        cache.set("esp32-001", CachedDevice(uuid4(), True))
+        assert cache.get("esp32-001") is not None
 
-            response = await async_client.get(f"/api/v1/devices/{device_id}/stats")
+        async with lifespan(app):
+            listeners[DEVICE_DEACTIVATED_CHANNEL]("esp32-001")
 
-            assert response.status_code == 200
+        assert cache.get("esp32-001") is None
@@ -0,0 +1,136 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db import Base
+from app.repositories.device_repository import (
+    _NOTIFY_STMT,
+    DEVICE_DEACTIVATED_CHANNEL,
+    DeviceRepository,
+)
+from app.services.device_service import DeviceExistsError, DeviceService
+
+
+@pytest.fixture
+async def device_service():
+    """Device service over an in-memory database."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_sessionmaker(engine)() as session:
+        yield DeviceService(DeviceRepository(session))
+
+    await engine.dispose()
+
+
+class TestBatchRegistration:
+    """Tests for registering several devices at once."""
+
+    async def test_registers_all_devices(self, device_service):
+        """Test that every device is stored with its own API key."""
+        results = await device_service.register_devices(
+            [("esp32-001", "Kitchen"), ("esp32-002", None)]
+        )
+
+        assert [result["device_id"] for result in results] == ["esp32-001", "esp32-002"]
+        assert len({result["api_key"] for result in results}) == 2
+        # Same form as a singly registered device's key
+        single = await device_service.register_device("esp32-003")
+        assert {len(result["api_key"]) for result in results} == {len(single["api_key"])}
+
+        devices = await device_service.list_devices()
+        assert {device["device_id"] for device in devices} == {
+            "esp32-001",
+            "esp32-002",
+            "esp32-003",
+        }
+
+    async def test_existing_device_rejects_whole_batch(self, device_service):
+        """Test that one taken device_id registers none of the batch."""
+        await device_service.register_device("esp32-002")
+
+        with pytest.raises(DeviceExistsError, match="esp32-002"):
+            await device_service.register_devices([("esp32-001", None), ("esp32-002", None)])
+
+        devices = await device_service.list_devices()
+        assert [device["device_id"] for device in devices] == ["esp32-002"]
+
+    async def test_rejects_repeated_device_id(self, device_service):
+        """Test that a device_id listed twice is rejected."""
+        with pytest.raises(ValueError, match="once per batch"):
+            await device_service.register_devices([("esp32-001", None), ("esp32-001", None)])
+
+
+class TestRegistration:
+    """Tests for registering a single device."""
+
+    async def test_duplicate_device_id_is_rejected(self, device_service):
+        """Test that registering a taken device_id keeps the original."""
+        first = await device_service.register_device("esp32-001", name="Kitchen")
+
+        with pytest.raises(DeviceExistsError, match="esp32-001"):
+            await device_service.register_device("esp32-001", name="Garage")
+
+        device = await device_service.get_device("esp32-001")
+        assert device["id"] == first["id"]
+        assert device["name"] == "Kitchen"
+
+
+class FakePostgresSession:
+    """Session stand-in on the PostgreSQL dialect that records statements."""
+
+    def __init__(self, rowcount: int) -> None:
+        self.executed: list[tuple[object, object]] = []
+        self._rowcount = rowcount
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+    async def execute(self, statement, params=None):
+        self.executed.append((statement, params))
+        return SimpleNamespace(rowcount=self._rowcount)
+
+
+class TestDeactivationNotify:
+    """Tests for announcing deactivations to other workers."""
+
+    async def test_postgresql_notifies_deactivated_channel(self):
+        """Test that a deactivation on PostgreSQL sends pg_notify with the device_id."""
+        session = FakePostgresSession(rowcount=1)
+
+        assert await DeviceRepository(session).deactivate("esp32-001")
+
+        assert session.executed[1:] == [
+            (_NOTIFY_STMT, {"channel": DEVICE_DEACTIVATED_CHANNEL, "payload": "esp32-001"})
+        ]
+        assert "pg_notify" in str(_NOTIFY_STMT.compile(dialect=postgresql.dialect()))
+
+    async def test_postgresql_unknown_device_sends_nothing(self):
+        """Test that deactivating a missing device sends no notification."""
+        session = FakePostgresSession(rowcount=0)
+
+        assert not await DeviceRepository(session).deactivate("nope")
+
+        assert len(session.executed) == 1
+
+    async def test_other_dialects_send_no_notify(self, device_service):
+        """Test that deactivation on SQLite issues only the UPDATE."""
+        await device_service.register_device("esp32-001")
+        engine = device_service._device_repo._session.get_bind()
+        statements: list[str] = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        await device_service.deactivate_device("esp32-001")
+        event.remove(engine, "before_cursor_execute", record)
+
+        assert any(statement.startswith("UPDATE devices") for statement in statements)
+        assert not any("pg_notify" in statement for statement in statements)
+        device = await device_service.get_device("esp32-001")
+        assert not device["is_active"]
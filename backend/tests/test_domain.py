@@ -1,10 +1,13 @@
-from datetime import UTC, datetime
+import time
+from datetime import UTC, datetime, timedelta, timezone
 from uuid import uuid4
 
 import pytest
 
+from app.domain.clock import as_utc, iso_now, iso_utc
 from app.domain.entities.device import Device, DeviceStatus
 from app.domain.entities.reading import Reading
+from app.domain.ids import uuid7
 from app.domain.value_objects.metrics import SensorMetrics
 from app.domain.value_objects.time_range import TimeRange
 
@@ -49,6 +52,12 @@ class TestDevice:
         assert DeviceStatus.OFFLINE.value == "offline"
         assert DeviceStatus.UNKNOWN.value == "unknown"
 
+    @pytest.mark.parametrize("device_id", ["esp 32", "ésp32", "esp32\n", "esp.32"])
+    def test_create_rejects_ids_outside_api_pattern(self, device_id):
+        """Test create accepts exactly the ids the API DTOs accept."""
+        with pytest.raises(ValueError, match="can only contain"):
+            Device.create(device_id=device_id, api_key_hash="hashed_key")
+
 
 class TestReading:
     """Tests for Reading entity."""
@@ -70,6 +79,31 @@ class TestReading:
         assert reading.metrics.humidity == 50.0
         assert reading.metrics.voltage == 3.3
 
+    def test_to_dict_is_built_once(self):
+        """Test to_dict reuses its result without affecting equality."""
+        reading_id = uuid4()
+        timestamp = datetime(2024, 1, 15, 10, 30, tzinfo=UTC)
+        reading = Reading(
+            id=reading_id,
+            device_id="esp32-001",
+            timestamp=timestamp,
+            metrics=SensorMetrics(temperature=25.0),
+        )
+
+        assert reading.to_dict() == {
+            "id": str(reading_id),
+            "device_id": "esp32-001",
+            "metrics": {"temperature": 25.0},
+            "timestamp": "2024-01-15T10:30:00Z",
+        }
+        assert reading.to_dict() is reading.to_dict()
+        assert reading == Reading(
+            id=reading_id,
+            device_id="esp32-001",
+            timestamp=timestamp,
+            metrics=SensorMetrics(temperature=25.0),
+        )
+
 
 class TestSensorMetrics:
     """Tests for SensorMetrics value object."""
@@ -82,35 +116,22 @@ class TestSensorMetrics:
         assert metrics.humidity == 50.0
         assert metrics.voltage == 3.3
 
-    def test_temperature_validation_min(self):
-        """Test temperature minimum validation."""
-        with pytest.raises(ValueError, match="temperature"):
-            SensorMetrics(temperature=-101.0, humidity=50.0, voltage=3.3)
-
-    def test_temperature_validation_max(self):
-        """Test temperature maximum validation."""
-        with pytest.raises(ValueError, match="temperature"):
-            SensorMetrics(temperature=151.0, humidity=50.0, voltage=3.3)
-
-    def test_humidity_validation_min(self):
-        """Test humidity minimum validation."""
-        with pytest.raises(ValueError, match="humidity"):
-            SensorMetrics(temperature=25.0, humidity=-1.0, voltage=3.3)
-
-    def test_humidity_validation_max(self):
-        """Test humidity maximum validation."""
-        with pytest.raises(ValueError, match="humidity"):
-            SensorMetrics(temperature=25.0, humidity=101.0, voltage=3.3)
-
-    def test_voltage_validation_min(self):
-        """Test voltage minimum validation."""
-        with pytest.raises(ValueError, match="voltage"):
-            SensorMetrics(temperature=25.0, humidity=50.0, voltage=-0.1)
-
-    def test_voltage_validation_max(self):
-        """Test voltage maximum validation."""
-        with pytest.raises(ValueError, match="voltage"):
-            SensorMetrics(temperature=25.0, humidity=50.0, voltage=60.0)
+    @pytest.mark.parametrize(
+        "field,value",
+        [
+            ("temperature", -101.0),
+            ("temperature", 151.0),
+            ("humidity", -1.0),
+            ("humidity", 101.0),
+            ("voltage", -0.1),
+            ("voltage", 60.0),
+        ],
+    )
+    def test_metric_out_of_range(self, field, value):
+        """Test each metric's minimum and maximum validation."""
+        valid = {"temperature": 25.0, "humidity": 50.0, "voltage": 3.3}
+        with pytest.raises(ValueError, match=f"(?i){field}"):
+            SensorMetrics(**{**valid, field: value})
 
     def test_metrics_equality(self):
         """Test metrics value equality."""
@@ -121,6 +142,21 @@ class TestSensorMetrics:
         assert m1 == m2
         assert m1 != m3
 
+    def test_unchecked_skips_validation(self):
+        """Test unchecked construction equals the validated value object."""
+        assert SensorMetrics.unchecked(temperature=25.0, voltage=3.3) == SensorMetrics(
+            temperature=25.0, voltage=3.3
+        )
+        assert SensorMetrics.unchecked(voltage=60.0).voltage == 60.0
+
+    def test_to_dict_is_built_once(self):
+        """Test to_dict reuses its result without affecting equality."""
+        metrics = SensorMetrics(temperature=25.0, humidity=50.0)
+
+        assert metrics.to_dict() == {"temperature": 25.0, "humidity": 50.0}
+        assert metrics.to_dict() is metrics.to_dict()
+        assert metrics == SensorMetrics(temperature=25.0, humidity=50.0)
+
 
 class TestTimeRange:
     """Tests for TimeRange value object."""
@@ -157,3 +193,68 @@ class TestTimeRange:
         assert tr.contains(within) is True
         assert tr.contains(before) is False
         assert tr.contains(after) is False
+
+    def test_last_is_timezone_aware(self):
+        """Test that TimeRange.last ends at the current UTC time."""
+        time_range = TimeRange.last("2h")
+
+        assert time_range.end.tzinfo is UTC
+        assert time_range.end - time_range.start == timedelta(hours=2)
+
+
+class TestUuid7:
+    """Tests for time-ordered UUID generation."""
+
+    def test_uuid7_version_and_variant(self):
+        """Test generated UUIDs carry version 7 and RFC 4122 variant."""
+        value = uuid7()
+
+        assert value.version == 7
+        assert value.variant == "specified in RFC 4122"
+
+    def test_uuid7_is_time_ordered(self):
+        """Test UUIDs from later milliseconds sort after earlier ones."""
+        first = uuid7()
+        time.sleep(0.002)
+        second = uuid7()
+
+        assert first < second
+
+    def test_uuid7_is_monotonic_within_millisecond(self):
+        """Test UUIDs generated in a burst are unique and strictly increasing."""
+        ids = [uuid7() for _ in range(10_000)]
+
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+        assert {value.version for value in ids} == {7}
+
+
+class TestIsoNow:
+    """Tests for the ISO 8601 clock."""
+
+    def test_iso_now_matches_datetime(self):
+        """Test formatted timestamps parse back to the current UTC time."""
+        before = datetime.now(UTC)
+        stamp = iso_now()
+        after = datetime.now(UTC)
+
+        assert stamp.endswith("Z")
+        parsed = datetime.fromisoformat(stamp[:-1]).replace(tzinfo=UTC)
+        assert before <= parsed <= after
+
+    def test_iso_utc_normalizes_aware_timestamps(self):
+        """Test naive and aware timestamps format identically."""
+        naive = datetime(2024, 1, 15, 10, 30)
+        aware = datetime(2024, 1, 15, 12, 30, tzinfo=timezone(timedelta(hours=2)))
+        utc = datetime(2024, 1, 15, 10, 30, tzinfo=UTC)
+
+        assert iso_utc(naive) == iso_utc(aware) == iso_utc(utc) == "2024-01-15T10:30:00Z"
+        assert iso_utc(utc.replace(microsecond=5)) == "2024-01-15T10:30:00.000005Z"
+
+    def test_as_utc_makes_naive_and_aware_comparable(self):
+        """Test naive timestamps are taken as UTC and aware ones converted."""
+        naive = datetime(2024, 1, 15, 10, 30)
+        aware = datetime(2024, 1, 15, 12, 30, tzinfo=timezone(timedelta(hours=2)))
+
+        assert as_utc(naive) == as_utc(aware)
+        assert as_utc(aware).tzinfo is UTC
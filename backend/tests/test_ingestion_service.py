@@ -1,4 +1,7 @@
+import asyncio
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime
+from types import SimpleNamespace
 from unittest.mock import AsyncMock
 from uuid import uuid4
 
@@ -7,7 +10,8 @@ import pytest
 from app.domain.entities.device import Device, DeviceStatus
 from app.domain.entities.reading import Reading
 from app.domain.value_objects.metrics import SensorMetrics
-from app.services.ingestion_service import IngestionService
+from app.services.device_cache import DeviceCache
+from app.services.ingestion_service import IngestionService, ReadingBatchWriter
 
 
 @pytest.fixture
@@ -65,7 +69,6 @@ def ingestion_service(device_repository, reading_repository, websocket_manager):
 class TestIngestionService:
     """Tests for IngestionService."""
 
-    @pytest.mark.asyncio
     async def test_ingest_reading_success(
         self,
         ingestion_service,
@@ -89,7 +92,6 @@ class TestIngestionService:
         device_repository.update_last_seen.assert_called_once()
         websocket_manager.broadcast.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_ingest_reading_unknown_device(
         self,
         ingestion_service,
@@ -108,7 +110,6 @@ class TestIngestionService:
         with pytest.raises(ValueError, match="Unknown device"):
             await ingestion_service.ingest_reading(payload)
 
-    @pytest.mark.asyncio
     async def test_ingest_reading_validates_metrics(
         self,
         ingestion_service,
@@ -124,7 +125,6 @@ class TestIngestionService:
         with pytest.raises(ValueError, match="temperature"):
             await ingestion_service.ingest_reading(payload)
 
-    @pytest.mark.asyncio
     async def test_ingest_reading_assigns_timestamp(
         self,
         ingestion_service,
@@ -147,3 +147,311 @@ class TestIngestionService:
 
         # Verify timestamp was assigned in the expected range
         assert reading_data is not None
+
+
+class FakeDeviceRepository:
+    """Device repository stand-in that records the calls made to it."""
+
+    def __init__(self, *devices: Device) -> None:
+        self.devices = {device.device_id: device for device in devices}
+        self.calls: list[tuple[str, object]] = []
+
+    async def get_by_id(self, device_id):
+        self.calls.append(("get_by_id", device_id))
+        return self.devices.get(device_id)
+
+    async def get_many_by_id(self, device_ids):
+        self.calls.append(("get_many_by_id", device_ids))
+        return {d: self.devices[d] for d in device_ids if d in self.devices}
+
+    async def update_last_seen(self, device_id, timestamp):
+        self.calls.append(("update_last_seen", device_id))
+
+    async def record_readings(self, seen):
+        self.calls.append(("record_readings", seen))
+
+
+class FakeReadingRepository:
+    """Reading repository stand-in that stamps readings with a fixed time."""
+
+    def __init__(self) -> None:
+        self.now = datetime.now(UTC)
+        self.inserted: list[list[dict]] = []
+
+    async def create(self, reading_id, device_id, device_uuid, metrics):
+        self.inserted.append([{"id": reading_id, "device_uuid": device_uuid}])
+        return Reading(id=reading_id, device_id=device_id, metrics=metrics, timestamp=self.now)
+
+    async def bulk_insert(self, rows):
+        self.inserted.append(rows)
+        return [self.now for _ in rows]
+
+
+class TestDeviceCache:
+    """Tests for caching device lookups on the ingest path."""
+
+    @pytest.fixture
+    def cached_service(self):
+        """Ingestion service with a device cache over fake repositories."""
+        device_repository = FakeDeviceRepository(
+            Device.create(device_id="esp32-001", api_key_hash="hashed_key"),
+            Device.create(device_id="esp32-002", api_key_hash="hashed_key"),
+        )
+        reading_repository = FakeReadingRepository()
+        settings = SimpleNamespace(device_api_keys_set=frozenset({"device-key"}))
+        cache = DeviceCache(maxsize=10, ttl=60)
+        service = IngestionService(
+            device_repository, reading_repository, settings, device_cache=cache
+        )
+        return service, device_repository, reading_repository, cache
+
+    async def test_repeat_ingest_skips_device_lookup(self, cached_service):
+        """Test that only the first ingest of a device queries it."""
+        service, device_repository, _, cache = cached_service
+
+        for _ in range(3):
+            await service.ingest("esp32-001", SensorMetrics(temperature=21.0), "device-key")
+
+        lookups = [call for call in device_repository.calls if call[0] == "get_by_id"]
+        assert lookups == [("get_by_id", "esp32-001")]
+
+        cache.invalidate("esp32-001")
+        await service.ingest("esp32-001", SensorMetrics(temperature=21.0), "device-key")
+        lookups = [call for call in device_repository.calls if call[0] == "get_by_id"]
+        assert len(lookups) == 2
+
+    async def test_batch_looks_up_uncached_devices_once(self, cached_service):
+        """Test that a batch queries only uncached devices, in one lookup."""
+        service, device_repository, reading_repository, cache = cached_service
+        await service.ingest("esp32-001", SensorMetrics(temperature=21.0), "device-key")
+        device_repository.calls.clear()
+        reading_repository.inserted.clear()
+
+        readings = await service.ingest_batch(
+            [
+                ("esp32-001", SensorMetrics(temperature=21.0)),
+                ("esp32-002", SensorMetrics(humidity=40.0)),
+                ("esp32-001", SensorMetrics(voltage=3.3)),
+            ],
+            "device-key",
+        )
+
+        assert [r.device_id for r in readings] == ["esp32-001", "esp32-002", "esp32-001"]
+        assert len(reading_repository.inserted) == 1
+        first, other = (
+            device_repository.devices["esp32-001"],
+            device_repository.devices["esp32-002"],
+        )
+        now = reading_repository.now
+        assert device_repository.calls == [
+            ("get_many_by_id", ["esp32-002"]),
+            ("record_readings", [(first.id, now, 2), (other.id, now, 1)]),
+        ]
+        assert cache.get("esp32-002") is not None
+
+    def test_evicts_least_recently_used(self):
+        """Test that the cache stays within its size bound."""
+        cache = DeviceCache(maxsize=2, ttl=60)
+        entry = (uuid4(), True)
+        for device_id in ("a", "b", "c"):
+            cache.set(device_id, entry)
+
+        assert cache.get("a") is None
+        assert cache.get("c") == entry
+
+    def test_entries_expire_on_monotonic_clock(self, monkeypatch):
+        """Test that entries vanish once their TTL has elapsed."""
+        now = 1000.0
+        monkeypatch.setattr("app.services.cache.time.monotonic", lambda: now)
+        cache = DeviceCache(maxsize=2, ttl=60)
+        cache.set("a", (uuid4(), True))
+
+        now += 59
+        assert cache.get("a") is not None
+        now += 2
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+class FakeSession:
+    """Session stand-in whose statements go nowhere."""
+
+    async def execute(self, statement, params=None):
+        return None
+
+
+@asynccontextmanager
+async def fake_session_factory():
+    """Session context that never touches a database."""
+    yield FakeSession()
+
+
+class TestReadingBatchWriter:
+    """Tests for the batched reading writer."""
+
+    @pytest.fixture
+    def copied(self, monkeypatch):
+        """Record COPY inserts instead of writing them."""
+        copied: list[list[dict]] = []
+
+        async def copy_insert(self, rows):
+            copied.append(rows)
+
+        monkeypatch.setattr(
+            "app.services.ingestion_service.ReadingRepository.copy_insert", copy_insert
+        )
+        return copied
+
+    @pytest.fixture
+    def batches(self, monkeypatch, copied):
+        """Record bulk inserts instead of writing them."""
+        batches: list[list[dict]] = []
+
+        async def bulk_insert(self, rows):
+            batches.append(rows)
+            return [datetime.now(UTC) for _ in rows]
+
+        monkeypatch.setattr(
+            "app.services.ingestion_service.ReadingRepository.bulk_insert", bulk_insert
+        )
+        return batches
+
+    async def test_concurrent_submits_share_one_batch(self, batches):
+        """Test that readings submitted together are inserted in one batch."""
+        writer = ReadingBatchWriter(fake_session_factory, max_batch_size=10, max_batch_delay=0.05)
+        await writer.start()
+
+        device_uuid = uuid4()
+        reading_ids = [uuid4() for _ in range(3)]
+        timestamps = await asyncio.gather(
+            *(
+                writer.submit(reading_id, device_uuid, SensorMetrics(temperature=20.0))
+                for reading_id in reading_ids
+            )
+        )
+        await writer.stop()
+
+        assert len(batches) == 1
+        assert [row["id"] for row in batches[0]] == reading_ids
+        assert all(row["device_uuid"] == device_uuid for row in batches[0])
+        # Timestamps come from the database, not the caller
+        assert all("timestamp" not in row for row in batches[0])
+        assert all(isinstance(ts, datetime) for ts in timestamps)
+        assert not writer.is_running
+
+    async def test_flush_records_last_seen_per_device(self, batches, monkeypatch):
+        """Test that a batch updates each device once, with its newest reading."""
+        recorded = []
+
+        async def record_readings(self, seen):
+            recorded.append(seen)
+
+        monkeypatch.setattr(
+            "app.services.ingestion_service.DeviceRepository.record_readings", record_readings
+        )
+        writer = ReadingBatchWriter(fake_session_factory, max_batch_size=10, max_batch_delay=0.05)
+        await writer.start()
+
+        first, second = uuid4(), uuid4()
+        timestamps = await asyncio.gather(
+            *(
+                writer.submit(uuid4(), device_uuid, SensorMetrics(temperature=20.0))
+                for device_uuid in (first, second, first)
+            )
+        )
+        await writer.stop()
+
+        assert recorded == [
+            [(first, max(timestamps[0], timestamps[2]), 2), (second, timestamps[1], 1)]
+        ]
+
+    async def test_failed_flush_reaches_waiters(self, monkeypatch):
+        """Test that a database error is raised to every caller in the batch."""
+
+        async def bulk_insert(self, rows):
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(
+            "app.services.ingestion_service.ReadingRepository.bulk_insert", bulk_insert
+        )
+
+        writer = ReadingBatchWriter(fake_session_factory, max_batch_size=10, max_batch_delay=0.01)
+        await writer.start()
+
+        results = await asyncio.gather(
+            *(writer.submit(uuid4(), uuid4(), SensorMetrics(humidity=50.0)) for _ in range(2)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        # The writer survives a failed batch
+        assert writer.is_running
+        await writer.stop()
+
+    async def test_submit_without_wait_returns_immediately(self, batches, copied):
+        """Test that wait=False queues the reading and returns None."""
+        writer = ReadingBatchWriter(fake_session_factory, max_batch_size=10, max_batch_delay=5.0)
+        await writer.start()
+
+        reading_id = uuid4()
+        result = await writer.submit(reading_id, uuid4(), SensorMetrics(voltage=3.3), wait=False)
+
+        assert result is None
+        assert copied == []
+
+        await writer.stop()
+        # Nobody waits for the stored timestamp, so the batch is copied
+        assert [row["id"] for row in copied[0]] == [reading_id]
+        assert batches == []
+
+    async def test_copy_follows_device_update(self, monkeypatch):
+        """Test that COPY is issued after the UPDATE that opens the transaction."""
+        statements = []
+
+        async def record_readings(self, seen):
+            statements.append("update")
+
+        async def copy_insert(self, rows):
+            statements.append("copy")
+
+        monkeypatch.setattr(
+            "app.services.ingestion_service.DeviceRepository.record_readings", record_readings
+        )
+        monkeypatch.setattr(
+            "app.services.ingestion_service.ReadingRepository.copy_insert", copy_insert
+        )
+        writer = ReadingBatchWriter(fake_session_factory, max_batch_size=10, max_batch_delay=5.0)
+        await writer.start()
+
+        await writer.submit(uuid4(), uuid4(), SensorMetrics(voltage=3.3), wait=False)
+        await writer.stop()
+
+        assert statements == ["update", "copy"]
+
+    async def test_stop_flushes_queued_readings(self, batches):
+        """Test that readings still queued at shutdown are written."""
+        writer = ReadingBatchWriter(fake_session_factory, max_batch_size=100, max_batch_delay=5.0)
+        await writer.start()
+
+        pending = [
+            asyncio.create_task(writer.submit(uuid4(), uuid4(), SensorMetrics(temperature=1.0)))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        await writer.stop()
+
+        await asyncio.gather(*pending)
+        assert sum(len(batch) for batch in batches) == 5
+
+    async def test_stop_after_crash_does_not_raise(self, batches):
+        """Test that stopping a writer whose task already exited is safe."""
+        writer = ReadingBatchWriter(fake_session_factory)
+        await writer.start()
+        writer._task.cancel()
+        await asyncio.sleep(0)
+
+        assert not writer.is_running
+        with pytest.raises(RuntimeError):
+            await writer.submit(uuid4(), uuid4(), SensorMetrics(temperature=1.0))
+
+        await writer.stop()
@@ -0,0 +1,199 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db import Base, DeviceModel
+from app.domain.ids import uuid7
+from app.domain.value_objects.time_range import TimeRange
+from app.repositories.device_repository import DeviceRepository
+from app.repositories.reading_repository import ReadingRepository
+
+_METRICS = (("temperature", "temp"), ("humidity", "humidity"), ("voltage", "voltage"))
+
+# Plain SQLite views with the same columns as the TimescaleDB rollups
+_READINGS_1M = """
+CREATE VIEW readings_1m AS
+SELECT device_uuid,
+       strftime('%Y-%m-%d %H:%M:00.000000', timestamp) AS bucket,
+       count(*) AS reading_count,
+       min(timestamp) AS first_reading,
+       max(timestamp) AS last_reading,
+       {aggregates}
+FROM readings GROUP BY 1, 2
+""".format(
+    aggregates=", ".join(
+        f"min({col}) AS {p}_min, max({col}) AS {p}_max, "
+        f"sum({col}) AS {p}_sum, count({col}) AS {p}_count"
+        for col, p in _METRICS
+    )
+)
+
+_READINGS_1H = """
+CREATE VIEW readings_1h AS
+SELECT device_uuid,
+       strftime('%Y-%m-%d %H:00:00.000000', bucket) AS bucket,
+       sum(reading_count) AS reading_count,
+       min(first_reading) AS first_reading,
+       max(last_reading) AS last_reading,
+       {aggregates}
+FROM readings_1m GROUP BY 1, 2
+""".format(
+    aggregates=", ".join(
+        f"min({p}_min) AS {p}_min, max({p}_max) AS {p}_max, "
+        f"sum({p}_sum) AS {p}_sum, sum({p}_count) AS {p}_count"
+        for _, p in _METRICS
+    )
+)
+
+NOW = datetime(2026, 10, 14, 12, 0, 0)
+
+
+@pytest.fixture
+async def reading_repository():
+    """Repository over an in-memory database with three days of readings."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text(_READINGS_1M))
+        await conn.execute(text(_READINGS_1H))
+
+    rng = random.Random(42)
+    async with async_sessionmaker(engine)() as session:
+        device = DeviceModel(device_id="esp32-001", api_key_hash="x", created_at=NOW)
+        session.add(device)
+        await session.flush()
+
+        repo = ReadingRepository(session)
+        await repo.bulk_insert(
+            [
+                {
+                    "id": uuid7(),
+                    "device_uuid": device.id,
+                    "timestamp": NOW - timedelta(seconds=rng.uniform(0, 3 * 86400)),
+                    "temperature": rng.uniform(-10.0, 40.0),
+                    "humidity": None if i % 3 == 0 else rng.uniform(0.0, 100.0),
+                    "voltage": None,
+                }
+                for i in range(2000)
+            ]
+        )
+        yield repo
+
+    await engine.dispose()
+
+
+class TestRollupStats:
+    """Tests for stats served from per-minute and per-hour rollups."""
+
+    @pytest.mark.parametrize(
+        "start,end",
+        [
+            # Whole hours plus partial minutes at both ends
+            (NOW - timedelta(hours=25, seconds=17.5), NOW - timedelta(seconds=3.2)),
+            # Less than one whole minute
+            (NOW - timedelta(seconds=50), NOW - timedelta(seconds=10)),
+            # Whole minutes but no whole hour
+            (NOW - timedelta(minutes=30, seconds=5), NOW - timedelta(minutes=2, seconds=1)),
+            # Aligned on hour boundaries
+            (NOW - timedelta(days=2), NOW),
+        ],
+    )
+    async def test_rollup_stats_match_raw_stats(self, reading_repository, start, end):
+        """Test that rollup-based stats equal stats computed from raw readings."""
+        time_range = TimeRange.between(start, end)
+
+        raw = await reading_repository.get_stats("esp32-001", time_range)
+        rolled = await reading_repository.get_stats_from_rollups("esp32-001", time_range)
+
+        assert rolled == raw
+
+
+class TestLatestPerDevice:
+    """Tests for loading every device's newest reading at once."""
+
+    async def test_matches_per_device_latest(self, reading_repository):
+        """Test that the bulk query returns the same reading as get_latest."""
+        latest = await reading_repository.get_latest_per_device()
+
+        assert list(latest) == ["esp32-001"]
+        assert latest["esp32-001"] == await reading_repository.get_latest("esp32-001")
+
+
+class TestDeviceReadingCount:
+    """Tests for the per-device reading counter kept on the devices row."""
+
+    async def test_last_seen_update_counts_reading(self, reading_repository):
+        """Test that each last_seen_at update also counts one reading."""
+        devices = DeviceRepository(reading_repository._session)
+
+        for _ in range(3):
+            await devices.update_last_seen("esp32-001", NOW)
+
+        reading_repository._session.expire_all()
+        device = await devices.get_by_id("esp32-001")
+        assert device.reading_count == 3
+        assert device.last_seen_at == NOW
+
+    async def test_record_readings_counts_per_device(self, reading_repository):
+        """Test that a batch update adds each device's reading count."""
+        devices = DeviceRepository(reading_repository._session)
+
+        device = await devices.get_by_id("esp32-001")
+        await devices.record_readings([(device.id, NOW, 5), (uuid7(), NOW, 1)])
+
+        reading_repository._session.expire_all()
+        found = await devices.get_many_by_id(["esp32-001", "nope"])
+        assert list(found) == ["esp32-001"]
+        assert found["esp32-001"].reading_count == 5
+        assert found["esp32-001"].last_seen_at == NOW
+
+
+class TestDeviceExistence:
+    """Tests for reads that also report whether the device exists."""
+
+    async def test_unknown_device(self, reading_repository):
+        """Test that an unregistered device is reported as missing."""
+        time_range = TimeRange.last("24h")
+
+        assert await reading_repository.get_latest_if_registered("nope") == (False, None)
+        assert await reading_repository.get_history("nope", time_range) is None
+        assert await reading_repository.get_stats("nope", time_range) is None
+        assert await reading_repository.get_stats_from_rollups("nope", time_range) is None
+
+    async def test_device_without_readings_in_range(self, reading_repository):
+        """Test that an empty range is distinguished from a missing device."""
+        time_range = TimeRange.between(NOW + timedelta(days=1), NOW + timedelta(days=2))
+
+        assert await reading_repository.get_history("esp32-001", time_range) == []
+        stats = await reading_repository.get_stats("esp32-001", time_range)
+        assert stats["reading_count"] == 0
+
+        found, latest = await reading_repository.get_latest_if_registered("esp32-001")
+        assert found
+        assert latest == await reading_repository.get_latest("esp32-001")
+
+
+class TestStreamHistory:
+    """Tests for streaming history through a server-side cursor."""
+
+    async def test_batches_match_history(self, reading_repository):
+        """Test that streamed batches concatenate to the serialized history."""
+        time_range = TimeRange.between(NOW - timedelta(days=1), NOW)
+
+        batches = await reading_repository.stream_history(
+            "esp32-001", time_range, limit=500, batch_size=200
+        )
+        streamed = [batch async for batch in batches]
+
+        history = await reading_repository.get_history("esp32-001", time_range, limit=500)
+        assert [len(batch) for batch in streamed] == [200, 200, 100]
+        assert sum(streamed, []) == [reading.to_dict() for reading in history]
+
+    async def test_unknown_device(self, reading_repository):
+        """Test that an unregistered device is reported before streaming."""
+        time_range = TimeRange.last("24h")
+
+        assert await reading_repository.stream_history("nope", time_range) is None
@@ -0,0 +1,71 @@
+import asyncio
+
+import orjson
+
+from app.infrastructure.websocket.manager import ALL_DEVICES, WebSocketManager
+
+
+class FakeWebSocket:
+    """WebSocket stand-in that records sent frames and can stall."""
+
+    def __init__(self, stalled: bool = False) -> None:
+        self.sent: list[str] = []
+        self.closed: int | None = None
+        self._stalled = stalled
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, data: str) -> None:
+        if self._stalled:
+            await asyncio.Event().wait()
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed = code
+
+
+class TestWebSocketManager:
+    """Tests for per-connection queued fan-out."""
+
+    async def test_frames_reach_device_and_all_subscribers(self):
+        """Test that one frame is queued for direct and all-device subscribers."""
+        manager = WebSocketManager()
+        device_ws, all_ws = FakeWebSocket(), FakeWebSocket()
+        await manager.connect(device_ws)
+        await manager.connect(all_ws)
+        await manager.subscribe(device_ws, "esp32-001")
+        await manager.subscribe(all_ws, ALL_DEVICES)
+
+        manager.publish_to_device("esp32-001", {"temperature": 21.5})
+        await asyncio.sleep(0)
+
+        expected = {"type": "reading", "device_id": "esp32-001", "data": {"temperature": 21.5}}
+        assert [orjson.loads(frame) for frame in device_ws.sent] == [expected]
+        assert all_ws.sent == device_ws.sent
+
+        await manager.disconnect(device_ws)
+        await manager.disconnect(all_ws)
+        assert manager.connection_count == 0
+        assert manager.subscription_count == 0
+
+    async def test_slow_client_is_dropped_without_blocking_others(self):
+        """Test that a client with a full queue is evicted and closed."""
+        manager = WebSocketManager(max_queued_frames=2)
+        fast, slow = FakeWebSocket(), FakeWebSocket(stalled=True)
+        await manager.connect(fast)
+        await manager.connect(slow)
+        await manager.subscribe(fast, "esp32-001")
+        await manager.subscribe(slow, "esp32-001")
+
+        for i in range(5):
+            manager.publish_to_device("esp32-001", {"temperature": float(i)})
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert len(fast.sent) == 5
+        assert slow.closed == 1013
+        assert manager.connection_count == 1
+        assert manager.subscription_count == 1
+
+        await manager.disconnect(fast)